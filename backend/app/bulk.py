@@ -0,0 +1,40 @@
+# backend/app/bulk.py
+from typing import Any, Optional, Sequence, Type
+
+from tortoise import BaseDBAsyncClient
+from tortoise.models import Model
+
+
+async def copy_records(
+    model: Type[Model],
+    columns: Sequence[str],
+    records: Sequence[Sequence[Any]],
+    using_db: Optional[BaseDBAsyncClient] = None,
+) -> int:
+    """
+    Write rows into the model's table in one round trip.
+
+    On PostgreSQL the rows are streamed with COPY through asyncpg's
+    copy_records_to_table. Other backends (SQLite in tests) fall back to bulk_create.
+
+    Args:
+        model: The model whose table receives the rows
+        columns: Column names, in the same order as the values of each record
+        records: Row tuples to write
+        using_db: Connection or transaction to write through
+
+    Returns:
+        The number of rows written
+    """
+    if not records:
+        return 0
+
+    conn = using_db or model._meta.db
+    if conn.capabilities.dialect == "postgres":
+        async with conn.acquire_connection() as raw_conn:
+            await raw_conn.copy_records_to_table(model._meta.db_table, columns=list(columns), records=records)
+    else:
+        objects = [model(**dict(zip(columns, record))) for record in records]
+        await model.bulk_create(objects, using_db=conn)
+
+    return len(records)
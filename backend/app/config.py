@@ -1,148 +1,111 @@
-import socket
-from typing import Any, Dict
+# backend/app/config.py
+import re
+import time
+from pathlib import Path
+from typing import Dict, Optional
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from tortoise import Tortoise
-from tortoise.contrib.fastapi import register_tortoise
+from tortoise import BaseDBAsyncClient, Tortoise
 
+from backend.app.db_config import describe_db_config, get_tortoise_config
+from backend.app.partitions import ensure_slip_partitions
 
-def can_resolve_host(hostname: str) -> bool:
-    """Check if a hostname can be resolved"""
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent.parent / "migrations" / "models"
+
+
+def get_latest_migration_version() -> Optional[str]:
+    """Return the file name of the newest aerich migration, which aerich records as its version"""
+    versions = [path.name for path in MIGRATIONS_DIR.glob("*.py") if re.match(r"\d+_", path.name)]
+    if not versions:
+        return None
+    return max(versions, key=lambda name: int(name.split("_", 1)[0]))
+
+
+async def get_applied_migration_version(conn: BaseDBAsyncClient) -> Optional[str]:
+    """Return the last migration aerich applied, or None if aerich has not run against this database"""
     try:
-        socket.gethostbyname(hostname)
-        return True
-    except socket.gaierror:
-        return False
+        _, rows = await conn.execute_query("SELECT version FROM aerich WHERE app = 'models' ORDER BY id DESC LIMIT 1")
+    except Exception:
+        return None
+    return rows[0]["version"] if rows else None
 
 
-def get_db_host() -> str:
-    """Determine the database host based on environment"""
-    # If "postgres" hostname can be resolved, use it (Docker environment)
-    if can_resolve_host("postgres"):
-        return "postgres"
-
-    # Otherwise, fallback to localhost (local development)
-    return "localhost"
-
-
-# Determine the database host
-DB_HOST = get_db_host()
-
-# Create Tortoise ORM config
-TORTOISE_ORM: Dict[str, Any] = {
-    "connections": {
-        "default": {
-            "engine": "tortoise.backends.asyncpg",
-            "credentials": {
-                "host": DB_HOST,
-                "port": "5432",
-                "user": "postgres",
-                "password": "postgres",
-                "database": "openchains",
-            },
-        }
-    },
-    "apps": {
-        "models": {
-            "models": ["backend.app.main", "aerich.models"],
-            "default_connection": "default",
-        },
-    },
-    "use_tz": False,
-    "timezone": "UTC",
-}
-
-
-async def init_db() -> None:
-    """Initialize the database with proper migrations"""
+async def schema_exists(conn: BaseDBAsyncClient) -> bool:
+    """Check whether the application tables exist, whether aerich or generate_schemas created them"""
     try:
-        # Show which database we're connecting to
-        print(f"Connecting to database at: {DB_HOST}")
-
-        # Initialize Tortoise ORM
-        await Tortoise.init(
-            connections={"default": TORTOISE_ORM["connections"]["default"]},
-            apps=TORTOISE_ORM["apps"],
-        )
-
-        # Get a connection
-        conn = Tortoise.get_connection("default")
-
-        try:
-            # Check if the role column already exists to avoid errors
-            check_query = """
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name='users' AND column_name='role';
-            """
-            result = await conn.execute_query(check_query)
-
-            if not result[1]:  # Column doesn't exist
-                print("Adding 'role' column to users table...")
-
-                # Add the column with a default value
-                await conn.execute_script(
-                    """
-                ALTER TABLE users
-                ADD COLUMN role VARCHAR(20) NOT NULL DEFAULT 'customer';
-                """
-                )
-
-                print("Migration completed successfully.")
-
-        except Exception as e:
-            print(f"Migration check failed: {e}")
-            # Continue with normal schema generation
-
-        # This will create tables and add any other missing columns
-        await Tortoise.generate_schemas(safe=True)
+        await conn.execute_query('SELECT 1 FROM "users" LIMIT 1')
+    except Exception:
+        return False
+    return True
+
+
+async def init_db() -> Dict[str, float]:
+    """
+    Initialize the ORM once and check the schema before serving.
 
+    On PostgreSQL the schema is owned by the aerich migrations, which also create the
+    partitions, indexes and stats triggers the models can't describe. Other databases
+    have no migrations, so their tables are generated from the models when missing.
+
+    Returns:
+        Seconds spent in each startup phase
+
+    Raises:
+        RuntimeError: If a PostgreSQL database has no schema yet, or aerich migrations are behind
+    """
+    timings: Dict[str, float] = {}
+    start_time = phase_start = time.perf_counter()
+
+    # Building the config resolves the database host, so it is timed separately
+    config = get_tortoise_config()
+    print(describe_db_config(config))
+    timings["config"] = time.perf_counter() - phase_start
+
+    phase_start = time.perf_counter()
+    try:
+        await Tortoise.init(config=config)
     except Exception as e:
         print(f"Database initialization error: {e}")
         raise
+    timings["orm_init"] = time.perf_counter() - phase_start
+
+    # Schema work is only needed when aerich migrations are missing or behind
+    phase_start = time.perf_counter()
+    conn = Tortoise.get_connection("default")
+    latest_version = get_latest_migration_version()
+    applied_version = await get_applied_migration_version(conn)
+    has_schema = applied_version == latest_version or await schema_exists(conn)
+    timings["schema_check"] = time.perf_counter() - phase_start
+
+    # The migrations are PostgreSQL-only; other databases without an aerich version get their
+    # tables from the models
+    migrated = applied_version is not None or conn.capabilities.dialect == "postgres"
+    if migrated and applied_version != latest_version:
+        # Serving the current models from an outdated schema fails every slips query, and
+        # generate_schemas can't upgrade one, so startup stops until aerich has run
+        if has_schema:
+            raise RuntimeError(
+                f"Schema version {applied_version} is not {latest_version}, run `aerich upgrade` to migrate it"
+            )
+        raise RuntimeError("Database is empty, run `aerich upgrade` to create the schema")
+    if not migrated and not has_schema:
+        print("Database is empty, generating tables")
+        phase_start = time.perf_counter()
+        await Tortoise.generate_schemas(safe=True)
+        timings["schema_generate"] = time.perf_counter() - phase_start
+
+    # Make sure inserts in the coming months have a slips partition to land in
+    phase_start = time.perf_counter()
+    # Partition maintenance is retried on the next start, so a failure here doesn't stop the app
+    try:
+        created = await ensure_slip_partitions(conn)
+    except Exception as e:
+        print(f"Slips partition maintenance error: {e}")
+    else:
+        if created:
+            print(f"Created slips partitions: {', '.join(created)}")
+    timings["partitions"] = time.perf_counter() - phase_start
 
+    timings["total"] = time.perf_counter() - start_time
+    print("Startup timings: " + ", ".join(f"{phase}={seconds * 1000:.1f}ms" for phase, seconds in timings.items()))
 
-def setup_app(app: FastAPI) -> None:
-    """Configure the app for production"""
-    # Set up CORS
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["http://localhost:5173", "http://frontend:5173"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-
-    # Create connection string based on detected host
-    db_url = f"postgres://postgres:postgres@{DB_HOST}:5432/openchains"
-
-    # Register Tortoise with production settings
-    register_tortoise(
-        app,
-        db_url=db_url,
-        modules={"models": ["backend.app.main"]},
-        generate_schemas=False,  # We handle this separately
-        add_exception_handlers=True,
-    )
-
-
-# For test environments
-def setup_test_app(app: FastAPI) -> None:
-    """Set up app for testing with SQLite in-memory database"""
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-
-    # Register Tortoise with in-memory SQLite for testing
-    register_tortoise(
-        app,
-        db_url="sqlite://:memory:",
-        modules={"models": ["backend.app.main"]},
-        generate_schemas=True,
-        add_exception_handlers=True,
-    )
+    return timings
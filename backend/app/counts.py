@@ -0,0 +1,70 @@
+# backend/app/counts.py
+import json
+from typing import Any, Dict, Iterable, Optional, Type
+
+from tortoise import BaseDBAsyncClient
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+
+# Planner estimates of the table and, when it is partitioned, of its leaf partitions
+ESTIMATE_SQL = """
+SELECT c.relkind, c.reltuples, c.oid = to_regclass($1::text) AS is_parent
+FROM pg_class c
+WHERE c.oid = to_regclass($1::text)
+   OR c.oid IN (SELECT relid FROM pg_partition_tree(to_regclass($1::text)) WHERE isleaf)
+"""
+
+
+def combine_estimates(rows: Iterable[Dict[str, Any]]) -> Optional[int]:
+    """
+    Pick the row estimate of a table from its pg_class rows and those of its leaf partitions.
+
+    Since PostgreSQL 14, ANALYZE on a partitioned table stores the total in the parent's
+    reltuples, so it is used as is; the leaves are only summed while the parent has no
+    estimate. A reltuples of -1 means the relation was never vacuumed or analyzed.
+    """
+    parent, leaves = None, []
+    for row in rows:
+        if row["is_parent"]:
+            parent = row
+        elif row["relkind"] == "r" and row["reltuples"] >= 0:
+            leaves.append(row)
+    if parent is None:
+        return None
+    if parent["reltuples"] >= 0:
+        return int(parent["reltuples"])
+    if parent["relkind"] != "p" or not leaves:
+        return None
+    return int(sum(row["reltuples"] for row in leaves))
+
+
+async def estimate_row_count(model: Type[Model], using_db: Optional[BaseDBAsyncClient] = None) -> Optional[int]:
+    """
+    Read the row count the planner keeps in pg_class.reltuples.
+
+    Returns None when the estimate is unavailable: on databases other than
+    PostgreSQL, or when the table has never been vacuumed or analyzed.
+    """
+    conn = using_db or model._meta.db
+    if conn.capabilities.dialect != "postgres":
+        return None
+
+    _, rows = await conn.execute_query(ESTIMATE_SQL, [model._meta.db_table])
+    return combine_estimates(rows)
+
+
+async def estimate_query_count(queryset: QuerySet[Any]) -> Optional[int]:
+    """
+    Read the number of rows the planner expects a query to return, without running it.
+
+    Returns None on databases other than PostgreSQL.
+    """
+    conn = queryset.model._meta.db
+    if conn.capabilities.dialect != "postgres":
+        return None
+
+    _, rows = await conn.execute_query(f"EXPLAIN (FORMAT JSON) {queryset.sql(params_inline=True)}")
+    plan = rows[0]["QUERY PLAN"]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,175 @@
+# backend/app/datagen.py
+import hashlib
+import math
+import random
+import secrets
+from bisect import bisect_right
+from decimal import Decimal
+from functools import lru_cache
+from itertools import accumulate
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+AMOUNT_DISTRIBUTIONS = ("uniform", "lognormal", "zipf")
+
+USERNAME_PREFIX = "test_user_"
+
+# Seeds are at most 48 bits, so usernames stay well within the 50-character column
+SEED_BITS = 48
+MAX_SEED = 2**SEED_BITS - 1
+
+# Generated cards are 16 digits: a Visa-style "4", 14 body digits and the Luhn check digit
+CARD_PREFIX = "4"
+CARD_BODY_SPACE = 10**14
+
+# Zipf ranks a card can draw; rank k caps the card's amounts at 1/k of the range
+ZIPF_RANKS = 1000
+
+# Doubled digit values for the Luhn checksum, with 9 subtracted when the double exceeds 9
+LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+
+def luhn_check_digit(payload: str) -> int:
+    """Return the digit that makes payload + digit pass the Luhn check"""
+    total = 0
+    # Starting from the rightmost payload digit, every other digit is doubled
+    for position, char in enumerate(reversed(payload)):
+        digit = ord(char) - 48
+        total += LUHN_DOUBLED[digit] if position % 2 == 0 else digit
+    return (10 - total % 10) % 10
+
+
+def is_luhn_valid(number: str) -> bool:
+    return len(number) > 1 and number.isdigit() and luhn_check_digit(number[:-1]) == int(number[-1])
+
+
+def split_range(start: int, end: int, parts: int) -> List[Tuple[int, int]]:
+    """Split [start, end) into at most parts contiguous, non-empty ranges of near-equal size"""
+    total = end - start
+    parts = max(1, min(parts, total))
+    size, remainder = divmod(total, parts)
+    ranges = []
+    for part in range(parts):
+        part_end = start + size + (1 if part < remainder else 0)
+        ranges.append((start, part_end))
+        start = part_end
+    return [(low, high) for low, high in ranges if high > low]
+
+
+def slips_per_user_index(index: int, user_count: int, slip_count: int) -> int:
+    """Spread slip_count slips over user_count users; the first slip_count % user_count users get one extra"""
+    per_user, remainder = divmod(slip_count, user_count)
+    return per_user + (1 if index < remainder else 0)
+
+
+@lru_cache(maxsize=8)
+def zipf_cumulative(exponent: float) -> List[float]:
+    return list(accumulate(1 / rank**exponent for rank in range(1, ZIPF_RANKS + 1)))
+
+
+class DataGenerator:
+    """
+    Seeded source of test usernames, card numbers and slip amounts.
+
+    Users are addressed by index: the username and card number of index i depend
+    only on the seed and i, so any batch size or split across workers produces the
+    same dataset. Amounts are drawn from a random stream keyed by the seed and a
+    caller-chosen key, such as the first user of a chunk.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        if seed is not None and not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"Seed must be between 0 and {MAX_SEED}")
+        self.seed = seed if seed is not None else secrets.randbits(SEED_BITS)
+        rng = random.Random(self.seed)
+
+        # Usernames embed the seed, so runs with different seeds never collide
+        self.username_prefix = f"{USERNAME_PREFIX}{self.seed}_"
+
+        # index -> (index * a + b) mod 10^14 is a bijection when a is coprime with 10,
+        # so card numbers are unique for every index below 10^14 and look unordered
+        self._card_multiplier = rng.randrange(CARD_BODY_SPACE) | 1
+        if self._card_multiplier % 5 == 0:
+            self._card_multiplier += 2
+        self._card_offset = rng.randrange(CARD_BODY_SPACE)
+        self._hash_key = self.seed.to_bytes(16, "little", signed=True)
+
+    def rng(self, stream: str, key: Hashable) -> random.Random:
+        """An independent random stream; string seeds are hashed the same way in every process"""
+        return random.Random(f"{self.seed}:{stream}:{key}")
+
+    def usernames(self, start: int, count: int) -> List[str]:
+        prefix = self.username_prefix
+        return [f"{prefix}{index}" for index in range(start, start + count)]
+
+    def card_numbers(self, start: int, count: int) -> List[str]:
+        multiplier, offset = self._card_multiplier, self._card_offset
+        cards = []
+        for index in range(start, start + count):
+            payload = f"{CARD_PREFIX}{(index * multiplier + offset) % CARD_BODY_SPACE:014d}"
+            cards.append(f"{payload}{luhn_check_digit(payload)}")
+        return cards
+
+    def zipf_ranks(self, cards: Sequence[str], exponent: float) -> List[int]:
+        """Give each card a stable rank in 1..ZIPF_RANKS drawn from a Zipf distribution"""
+        cumulative = zipf_cumulative(exponent)
+        scale = cumulative[-1] / 2**64
+        ranks = []
+        for card in cards:
+            # A keyed hash of the card stands in for a uniform draw, so the rank is the same on every call
+            digest = hashlib.blake2b(card.encode(), key=self._hash_key, digest_size=8).digest()
+            ranks.append(min(bisect_right(cumulative, int.from_bytes(digest, "little") * scale) + 1, ZIPF_RANKS))
+        return ranks
+
+    def amounts(
+        self,
+        cards: Sequence[str],
+        min_amount: float,
+        max_amount: float,
+        distribution: str = "uniform",
+        key: Hashable = 0,
+        lognormal_sigma: float = 1.0,
+        zipf_exponent: float = 1.2,
+    ) -> List[Decimal]:
+        """
+        Draw one amount per entry of cards, in whole cents between min_amount and max_amount.
+
+        Args:
+            cards: Card number of each slip; repeat a card for several slips
+            min_amount: Smallest amount
+            max_amount: Largest amount
+            distribution: "uniform"; "lognormal", centred on the geometric mean of the
+                bounds and clamped to them; or "zipf", where each card draws a Zipf rank k
+                once and its amounts are uniform up to 1/k of the range, so a few cards
+                carry most of the volume
+            key: Selects the random stream, so the same key reproduces the same amounts
+            lognormal_sigma: Spread of the log-normal distribution
+            zipf_exponent: Exponent of the Zipf distribution; larger is more skewed
+
+        Returns:
+            The amounts as Decimals with two decimal places
+        """
+        if distribution not in AMOUNT_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown distribution {distribution!r}, expected one of {', '.join(AMOUNT_DISTRIBUTIONS)}"
+            )
+
+        rng = self.rng("amounts", key)
+        # At least a cent, so the log-normal centre is defined
+        min_cents = max(1, round(min_amount * 100))
+        max_cents = max(min_cents, round(max_amount * 100))
+        draw_cents = rng.randint
+
+        if distribution == "uniform":
+            cents = [draw_cents(min_cents, max_cents) for _ in cards]
+        elif distribution == "lognormal":
+            mu = (math.log(min_cents) + math.log(max_cents)) / 2
+            draw = rng.lognormvariate
+            cents = [min(max(round(draw(mu, lognormal_sigma)), min_cents), max_cents) for _ in cards]
+        else:
+            span = max_cents - min_cents
+            # Cards repeat once per slip, so each distinct card is ranked only once
+            distinct = list(dict.fromkeys(cards))
+            rank_of = dict(zip(distinct, self.zipf_ranks(distinct, zipf_exponent)))
+            cents = [draw_cents(min_cents, min_cents + span // rank_of[card]) for card in cards]
+
+        return [Decimal(value).scaleb(-2) for value in cents]
@@ -1,23 +1,116 @@
 # backend/app/db_config.py
-TORTOISE_ORM = {
-    "connections": {
-        "default": {
+import os
+import socket
+from functools import lru_cache
+from typing import Any, Dict
+
+from tortoise.backends.base.config_generator import expand_db_url
+
+from backend.app.metrics import instrument_connection
+
+
+def can_resolve_host(hostname: str) -> bool:
+    """Check if a hostname can be resolved"""
+    try:
+        socket.gethostbyname(hostname)
+        return True
+    except socket.gaierror:
+        return False
+
+
+def get_db_host() -> str:
+    """Determine the database host based on environment"""
+    if db_host := os.environ.get("DB_HOST"):
+        return db_host
+
+    # If "postgres" hostname can be resolved, use it (Docker environment)
+    if can_resolve_host("postgres"):
+        return "postgres"
+
+    # Otherwise, fallback to localhost (local development)
+    return "localhost"
+
+
+def get_pool_settings() -> Dict[str, Any]:
+    """Read asyncpg pool sizing, statement cache and timeout settings from the environment"""
+    server_settings = {}
+    if statement_timeout := os.environ.get("DB_STATEMENT_TIMEOUT_MS"):
+        server_settings["statement_timeout"] = statement_timeout
+
+    return {
+        "minsize": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+        "maxsize": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+        "max_inactive_connection_lifetime": float(os.environ.get("DB_MAX_INACTIVE_CONNECTION_LIFETIME", 300)),
+        "statement_cache_size": int(os.environ.get("DB_STATEMENT_CACHE_SIZE", 100)),
+        "command_timeout": float(os.environ.get("DB_COMMAND_TIMEOUT", 60)),
+        "application_name": os.environ.get("DB_APPLICATION_NAME", "openchains"),
+        "server_settings": server_settings,
+        # Record query durations for the /metrics endpoint
+        "init": instrument_connection,
+    }
+
+
+def get_db_connection() -> Dict[str, Any]:
+    """
+    Build the Tortoise connection config.
+
+    DATABASE_URL takes precedence; otherwise DB_HOST, DB_PORT, DB_USER,
+    DB_PASSWORD and DB_NAME are used. Pool settings only apply to PostgreSQL.
+    """
+    if db_url := os.environ.get("DATABASE_URL"):
+        connection = expand_db_url(db_url)
+    else:
+        connection = {
             "engine": "tortoise.backends.asyncpg",
             "credentials": {
-                "host": "postgres",  # Use "postgres" for Docker, "localhost" for local dev
-                "port": "5432",
-                "user": "postgres",
-                "password": "postgres",
-                "database": "openchains",
+                "host": get_db_host(),
+                "port": int(os.environ.get("DB_PORT", 5432)),
+                "user": os.environ.get("DB_USER", "postgres"),
+                "password": os.environ.get("DB_PASSWORD", "postgres"),
+                "database": os.environ.get("DB_NAME", "openchains"),
             },
         }
-    },
-    "apps": {
-        "models": {
-            "models": ["backend.app.main", "aerich.models"],
-            "default_connection": "default",
+
+    if connection["engine"] == "tortoise.backends.asyncpg":
+        connection["credentials"] = {**connection["credentials"], **get_pool_settings()}
+    return connection
+
+
+def describe_db_config(config: Dict[str, Any]) -> str:
+    """Summarize the effective connection and pool settings, without the password"""
+    connection = config["connections"]["default"]
+    credentials = connection["credentials"]
+    if connection["engine"] != "tortoise.backends.asyncpg":
+        return f"Database: {connection['engine']} {credentials.get('file_path', '')}".rstrip()
+
+    return (
+        f"Database: {credentials['user']}@{credentials['host']}:{credentials['port']}/{credentials['database']} "
+        f"pool={credentials['minsize']}..{credentials['maxsize']} "
+        f"max_inactive_lifetime={credentials['max_inactive_connection_lifetime']}s "
+        f"statement_cache_size={credentials['statement_cache_size']} "
+        f"command_timeout={credentials['command_timeout']}s "
+        f"application_name={credentials['application_name']}"
+    )
+
+
+@lru_cache(maxsize=None)
+def get_tortoise_config() -> Dict[str, Any]:
+    """Build the Tortoise config on first use, so importing this module never blocks on DNS"""
+    return {
+        "connections": {"default": get_db_connection()},
+        "apps": {
+            "models": {
+                "models": ["backend.app.main", "aerich.models"],
+                "default_connection": "default",
+            },
         },
-    },
-    "use_tz": False,
-    "timezone": "UTC",
-}
+        "use_tz": False,
+        "timezone": "UTC",
+    }
+
+
+def __getattr__(name: str) -> Any:
+    # TORTOISE_ORM is resolved lazily; aerich reads it as backend.app.db_config.TORTOISE_ORM
+    if name == "TORTOISE_ORM":
+        return get_tortoise_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
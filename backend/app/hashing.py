@@ -0,0 +1,172 @@
+# backend/app/hashing.py
+import asyncio
+import importlib.util
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from backend.app.metrics import Histogram
+
+T = TypeVar("T")
+
+# bcrypt calls take tens to hundreds of milliseconds, queueing can push them into seconds
+HASHING_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5, 5.0)
+
+PASSWORD_SCHEMES = ("bcrypt", "argon2")
+
+
+def argon2_available() -> bool:
+    """argon2 hashing needs the optional argon2-cffi package"""
+    return importlib.util.find_spec("argon2") is not None
+
+
+def build_password_context(
+    scheme: str = "bcrypt",
+    bcrypt_rounds: int = 12,
+    argon2_memory_cost: int = 65536,
+    argon2_time_cost: int = 3,
+    argon2_parallelism: int = 4,
+) -> CryptContext:
+    """
+    Build the password hashing policy.
+
+    New hashes use scheme with exactly the given cost. Hashes made with the other
+    scheme, or with different cost parameters, still verify but are reported as
+    needing an update, so they can be rehashed on the next successful login.
+    """
+    if scheme not in PASSWORD_SCHEMES:
+        raise ValueError(f"Unsupported password scheme {scheme!r}, expected one of {', '.join(PASSWORD_SCHEMES)}")
+    if scheme == "argon2" and not argon2_available():
+        raise RuntimeError("The argon2 password scheme requires the argon2-cffi package")
+
+    # argon2 hashes can only be verified when its backend is installed
+    schemes = [scheme] + [other for other in PASSWORD_SCHEMES if other != scheme and argon2_available()]
+    return CryptContext(
+        schemes=schemes,
+        default=scheme,
+        deprecated="auto",
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__default_rounds=argon2_time_cost,
+        argon2__min_rounds=argon2_time_cost,
+        argon2__max_rounds=argon2_time_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+def create_password_context() -> CryptContext:
+    """Build the hashing policy from PASSWORD_SCHEME, BCRYPT_ROUNDS and ARGON2_* environment variables"""
+    return build_password_context(
+        scheme=os.environ.get("PASSWORD_SCHEME", "bcrypt"),
+        bcrypt_rounds=int(os.environ.get("BCRYPT_ROUNDS", 12)),
+        argon2_memory_cost=int(os.environ.get("ARGON2_MEMORY_COST", 65536)),
+        argon2_time_cost=int(os.environ.get("ARGON2_TIME_COST", 3)),
+        argon2_parallelism=int(os.environ.get("ARGON2_PARALLELISM", 4)),
+    )
+
+
+# Process pool workers import this module too, so they build the same policy from the environment
+pwd_context = create_password_context()
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; on success also return a new hash if the stored one uses an outdated policy"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+class HashingSaturatedError(Exception):
+    """Raised when the hashing executor queue is full"""
+
+
+class HashingExecutor:
+    """Bounded executor that keeps CPU-bound password hashing off the event loop"""
+
+    def __init__(self, workers: int, max_pending: int, kind: str = "thread") -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.kind = kind
+        self._pool: Optional[Executor] = None
+
+        # Counters are only touched from the event loop thread, so no locking is needed
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.duration = Histogram(HASHING_BUCKETS)
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hashing")
+        return self._pool
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run func in the pool, rejecting the call if too many are already queued"""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HashingSaturatedError(f"Hashing queue is full ({self.pending} pending)")
+
+        self.pending += 1
+        self.submitted += 1
+        start_time = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._get_pool(), func, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            return result
+        finally:
+            self.pending -= 1
+            self.duration.observe(time.perf_counter() - start_time)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the executor counters"""
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_ms": round(self.duration.sum / self.duration.count * 1000, 2) if self.duration.count else 0.0,
+            "p99_ms": round(self.duration.quantile(0.99) * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def create_hashing_executor() -> HashingExecutor:
+    """Build the executor from HASH_* environment variables"""
+    workers = int(os.environ.get("HASH_WORKERS", min(4, os.cpu_count() or 1)))
+    return HashingExecutor(
+        workers=workers,
+        max_pending=int(os.environ.get("HASH_MAX_PENDING", workers * 16)),
+        kind=os.environ.get("HASH_EXECUTOR", "thread"),
+    )
+
+
+hashing_executor = create_hashing_executor()
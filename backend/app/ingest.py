@@ -0,0 +1,163 @@
+# backend/app/ingest.py
+import csv
+import json
+import os
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import Field, StringConstraints, TypeAdapter, ValidationError
+from typing_extensions import Annotated, NotRequired, TypedDict
+
+# Rows validated and written per COPY; each batch commits on its own
+SLIP_INGEST_BATCH_SIZE = int(os.environ.get("SLIP_INGEST_BATCH_SIZE", 5000))
+# Rejected rows reported per batch; the rest are only counted
+MAX_BATCH_ERRORS = 20
+
+# Content types accepted by POST /slips/bulk
+INGEST_FORMATS = {
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+
+class SlipRow(TypedDict):
+    card_number: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=16)]
+    amount: Annotated[Decimal, Field(gt=0, max_digits=10, decimal_places=2)]
+    user_id: NotRequired[Optional[int]]
+    created_at: NotRequired[Optional[datetime]]
+
+
+# A TypedDict list validates the whole batch in one call, without building a model per row
+slip_rows_adapter: TypeAdapter[List[SlipRow]] = TypeAdapter(List[SlipRow])
+
+
+class RowError(Exception):
+    """A row that couldn't be parsed or validated"""
+
+
+class BatchResult:
+    """Outcome of validating and writing one batch"""
+
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.accepted = 0
+        self.rejected = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def reject(self, row: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_BATCH_ERRORS:
+            self.errors.append({"row": row, "error": error})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"batch": self.number, "accepted": self.accepted, "rejected": self.rejected, "errors": self.errors}
+
+
+def detect_format(content_type: Optional[str]) -> Optional[str]:
+    """Map a Content-Type header to an ingest format; a missing header means a JSON array"""
+    if not content_type:
+        return "json"
+    return INGEST_FORMATS.get(content_type.split(";", 1)[0].strip().lower())
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into lines without reading it all into memory"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode(errors="replace").rstrip("\r")
+    if buffer:
+        yield buffer.decode(errors="replace").rstrip("\r")
+
+
+def parse_line(fmt: str, line: str, header: List[str]) -> Any:
+    """Parse one NDJSON or CSV data line, returning a RowError when it is malformed"""
+    if fmt == "ndjson":
+        try:
+            return json.loads(line)
+        except ValueError as exc:
+            return RowError(f"Invalid JSON: {exc}")
+
+    values = next(csv.reader([line]))
+    if len(values) != len(header):
+        return RowError(f"Expected {len(header)} columns, got {len(values)}")
+    # Empty cells are missing values, so optional columns can be left blank
+    return {name: value for name, value in zip(header, values) if value != ""}
+
+
+async def iter_rows(fmt: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yield (row number, raw row) pairs from a request body.
+
+    NDJSON and CSV are parsed line by line as the body arrives; a JSON array has to
+    be read whole. Rows that can't be parsed are yielded as RowError so they are
+    counted against their batch instead of failing the request. CSV rows are split
+    per line, so quoted values can't contain newlines.
+
+    Raises:
+        RowError: If a JSON body isn't a valid JSON array
+    """
+    if fmt == "json":
+        body = b"".join([chunk async for chunk in chunks])
+        try:
+            rows = json.loads(body or b"[]")
+        except ValueError as exc:
+            raise RowError(f"Invalid JSON: {exc}") from exc
+        if not isinstance(rows, list):
+            raise RowError("Expected a JSON array of slips")
+        for number, row in enumerate(rows, start=1):
+            yield number, row
+        return
+
+    header: Optional[List[str]] = None if fmt == "csv" else []
+    number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        if header is None:
+            header = [name.strip() for name in next(csv.reader([line]))]
+            continue
+        number += 1
+        yield number, parse_line(fmt, line, header)
+
+
+def validate_slip_rows(rows: List[Tuple[int, Any]], result: BatchResult) -> List[Tuple[int, SlipRow]]:
+    """
+    Validate a batch of raw rows, recording rejected ones on result.
+
+    The batch is validated in one call; only when it has invalid rows are the
+    remaining rows validated again without them.
+
+    Returns:
+        (row number, validated row) pairs; created_at defaults to now and is made timezone-aware
+    """
+    candidates = []
+    for number, row in rows:
+        if isinstance(row, RowError):
+            result.reject(number, str(row))
+        else:
+            candidates.append((number, row))
+
+    try:
+        validated = slip_rows_adapter.validate_python([row for _, row in candidates])
+    except ValidationError as exc:
+        invalid: Dict[int, str] = {}
+        for error in exc.errors(include_url=False):
+            index = int(error["loc"][0])
+            field = ".".join(str(part) for part in error["loc"][1:])
+            invalid.setdefault(index, f"{field}: {error['msg']}" if field else error["msg"])
+        for index, message in sorted(invalid.items()):
+            result.reject(candidates[index][0], message)
+        candidates = [candidate for index, candidate in enumerate(candidates) if index not in invalid]
+        validated = slip_rows_adapter.validate_python([row for _, row in candidates])
+
+    now = datetime.now(UTC)
+    for slip in validated:
+        created_at = slip.get("created_at") or now
+        slip["created_at"] = created_at if created_at.tzinfo else created_at.replace(tzinfo=UTC)
+    return [(number, slip) for (number, _), slip in zip(candidates, validated)]
@@ -0,0 +1,147 @@
+# backend/app/jobs.py
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class Job:
+    """Progress and outcome of a single workload run"""
+
+    def __init__(self, kind: str) -> None:
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = JobStatus.PENDING
+        self.total: Optional[int] = None
+        self.done = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def set_total(self, total: int) -> None:
+        self.total = total
+
+    def advance(self, rows: int) -> None:
+        self.done += rows
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the job, including throughput and an ETA while it is running"""
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+
+        rows_per_second = self.done / elapsed if elapsed > 0 else 0.0
+        progress = None
+        eta_seconds = None
+        if self.total:
+            progress = min(self.done / self.total, 1.0)
+            if not self.is_finished and rows_per_second > 0:
+                eta_seconds = round(max(self.total - self.done, 0) / rows_per_second, 1)
+
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status.value,
+            "total": self.total,
+            "done": self.done,
+            "progress": progress,
+            "rows_per_second": round(rows_per_second, 1),
+            "elapsed_seconds": round(elapsed, 3),
+            "eta_seconds": eta_seconds,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+JobFunc = Callable[[Job], Awaitable[Dict[str, Any]]]
+
+
+class JobManager:
+    """Runs workloads as background tasks, at most max_concurrent at a time"""
+
+    def __init__(self, max_concurrent: int, max_finished: int = 100) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_finished = max_finished
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    def submit(self, kind: str, func: JobFunc) -> Job:
+        """Schedule func to run in the background and return its job"""
+        job = Job(kind)
+        self._jobs[job.id] = job
+        job._task = asyncio.create_task(self._run(job, func, self._get_semaphore()))
+        self._prune()
+        return job
+
+    async def run(self, kind: str, func: JobFunc) -> Dict[str, Any]:
+        """Run func in the caller's task, waiting for a slot shared with background jobs; errors propagate"""
+        async with self._get_semaphore():
+            return await func(Job(kind))
+
+    async def _run(self, job: Job, func: JobFunc, semaphore: asyncio.Semaphore) -> None:
+        try:
+            async with semaphore:
+                job.status = JobStatus.RUNNING
+                job.started_at = time.time()
+                job.result = await func(job)
+                job.status = JobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = JobStatus.CANCELLED
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = str(e) or type(e).__name__
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs once more than max_finished are kept"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[: max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a pending or running job, returning False if it already finished"""
+        job = self._jobs.get(job_id)
+        if job is None or job.is_finished or job._task is None:
+            return False
+        job._task.cancel()
+        return True
+
+    async def shutdown(self) -> None:
+        tasks = [job._task for job in self._jobs.values() if job._task is not None and not job.is_finished]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+job_manager = JobManager(max_concurrent=int(os.environ.get("JOB_MAX_CONCURRENT", 1)))
@@ -1,25 +1,69 @@
 # Import required modules
-import random
+import base64
+import json
+import os
 import time
-import typing
 from contextlib import asynccontextmanager
-from datetime import UTC, datetime, timedelta
-from typing import Any, AsyncGenerator, Callable, Dict, Optional, Union
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import partial
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, List, Optional, Tuple, Type, TypeVar
 
-from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
-from passlib.context import CryptContext
-from pydantic import BaseModel
-from starlette.middleware.base import BaseHTTPMiddleware
-from tortoise import Tortoise
-from tortoise.contrib.fastapi import register_tortoise
-from tortoise.fields import BooleanField, CharField, DatetimeField, DecimalField, IntField
+from pydantic import BaseModel, Field
+from tortoise import BaseDBAsyncClient, Tortoise, connections
+from tortoise.contrib.fastapi import tortoise_exception_handlers
+from tortoise.expressions import Q, Subquery
+from tortoise.fields import (
+    BigIntField,
+    BooleanField,
+    CharField,
+    DatetimeField,
+    DecimalField,
+    ForeignKeyField,
+    ForeignKeyNullableRelation,
+    IntField,
+    OnDelete,
+)
+from tortoise.functions import Max, Min, Sum
 from tortoise.models import Model
+from tortoise.queryset import QuerySet
+from tortoise.signals import post_delete, post_save
+from tortoise.transactions import in_transaction
+
+from backend.app.bulk import copy_records
+from backend.app.cache import SingleFlight, TTLCache
+from backend.app.config import init_db
+from backend.app.counts import estimate_query_count, estimate_row_count
+from backend.app.datagen import AMOUNT_DISTRIBUTIONS, MAX_SEED, DataGenerator
+from backend.app.export import EXPORT_FORMATS, stream_export
+from backend.app.hashing import HashingSaturatedError, get_password_hash, hashing_executor, verify_and_update_password
+from backend.app.ingest import (
+    SLIP_INGEST_BATCH_SIZE,
+    BatchResult,
+    RowError,
+    detect_format,
+    iter_rows,
+    validate_slip_rows,
+)
+from backend.app.jobs import Job, JobFunc, job_manager
+from backend.app.metrics import MetricsWriter, query_metrics, request_metrics
+from backend.app.middleware import TimingMiddleware, start_request_logging, stop_request_logging
+from backend.app.tokens import ACCESS_TOKEN_EXPIRE_MINUTES, TokenError, decode_token, encode_token, token_revocations
+
+# Generator limits
+MAX_GENERATED_USERS = 1_000_000
+GENERATOR_BATCH_SIZE = int(os.environ.get("GENERATOR_BATCH_SIZE", 5000))
+GENERATED_USERS_PREVIEW_LIMIT = 1000
+SLIP_GENERATOR_USER_CHUNK = int(os.environ.get("SLIP_GENERATOR_USER_CHUNK", 1000))
+CLEANUP_BATCH_SIZE = int(os.environ.get("CLEANUP_BATCH_SIZE", 10000))
 
-from backend.app.db_config import TORTOISE_ORM
-from backend.tests.config import init_db, setup_prod_app
+# Slip listing limits
+SLIPS_PAGE_SIZE = 100
+MAX_SLIPS_PAGE_SIZE = 1000
 
 
 # Define token models
@@ -52,18 +96,39 @@ class User(Model):
         table = "users"
 
 
-# Define Slip model
+# Define Slip model; on PostgreSQL the table is range-partitioned by month on created_at (see partitions.py)
 class Slip(Model):
     id = IntField(primary_key=True)
+    # Owning user; nullable until the backfill has linked slips written before the column existed
+    user: ForeignKeyNullableRelation["User"] = ForeignKeyField(
+        "models.User", related_name="slips", null=True, on_delete=OnDelete.SET_NULL
+    )
+    user_id: Optional[int]
     card_number = CharField(max_length=16)
     amount = DecimalField(max_digits=10, decimal_places=2)
     created_at = DatetimeField(auto_now_add=True)
     updated_at = DatetimeField(auto_now=True)
 
     class Meta:
+        # Indexes are owned by the aerich migrations (idx_slips_user_id_created_at and friends)
         table = "slips"
 
 
+# Hourly per-card rollup of slips, maintained by triggers on the slips table
+class SlipStatHourly(Model):
+    id = IntField(primary_key=True)
+    card_number = CharField(max_length=16)
+    bucket = DatetimeField()
+    slip_count = BigIntField()
+    total_amount = DecimalField(max_digits=20, decimal_places=2)
+    min_amount = DecimalField(max_digits=10, decimal_places=2)
+    max_amount = DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        table = "slip_stats_hourly"
+        unique_together = (("card_number", "bucket"),)
+
+
 # Define input models
 class UserCreate(BaseModel):
     username: str
@@ -76,81 +141,106 @@ class AdminCreate(BaseModel):
     password: str
 
 
-# Define middleware for timing requests
-class TimingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable[[Request], typing.Awaitable[Response]]) -> Response:
-        # Record the start time
-        start_time = time.time()
-
-        # Process the request
-        response = await call_next(request)
-
-        # Calculate the processing time
-        process_time = time.time() - start_time
+# Password utilities
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-        # Format the time to be more readable (in milliseconds with 2 decimal places)
-        formatted_process_time = f"{process_time * 1000:.2f}ms"
+T = TypeVar("T")
 
-        # Add the timing header to the response
-        response.headers["X-Process-Time"] = formatted_process_time
+# Cache of authenticated users keyed by token subject, so hot paths skip the users table
+user_cache: TTLCache[str, User] = TTLCache(
+    maxsize=int(os.environ.get("USER_CACHE_SIZE", 10000)),
+    ttl=float(os.environ.get("USER_CACHE_TTL", 30)),
+)
 
-        # Log the request with timing information
-        path = request.url.path
-        method = request.method
-        status_code = response.status_code
-        print(f"Request: {method} {path} - Status: {status_code} - Time: {formatted_process_time}")
 
-        return response
+@post_save(User)
+async def invalidate_cached_user_on_save(
+    sender: Type[User],
+    instance: User,
+    created: bool,
+    using_db: Optional[BaseDBAsyncClient],
+    update_fields: List[str],
+) -> None:
+    # Role or is_active changes must not be served from a stale snapshot
+    user_cache.invalidate(instance.username)
+    # Tokens minted before a role or password change must stop working
+    if not created:
+        token_revocations.revoke(instance.username)
 
 
-# Password utilities
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+@post_delete(User)
+async def invalidate_cached_user_on_delete(
+    sender: Type[User],
+    instance: User,
+    using_db: Optional[BaseDBAsyncClient],
+) -> None:
+    user_cache.invalidate(instance.username)
+    token_revocations.revoke(instance.username)
 
 
 # Helper functions
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
+async def offload_hashing(func: Callable[..., T], *args: Any) -> T:
+    """Run a password hashing helper on the hashing executor instead of the event loop"""
+    try:
+        return await hashing_executor.run(func, *args)
+    except HashingSaturatedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
 
+def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+    return encode_token(data, expires_delta or timedelta(minutes=30))
 
-def create_access_token(data: Dict[str, Union[str, datetime]], expires_delta: Optional[timedelta] = None) -> str:
-    to_encode: Dict[str, Union[str, datetime]] = data.copy()
-    if expires_delta:
-        expire = datetime.now(UTC) + expires_delta
-    else:
-        expire = datetime.now(UTC) + timedelta(minutes=30)
-    to_encode.update({"exp": expire})
-    encoded_jwt: str = jwt.encode(to_encode, "your-secret-key", algorithm="HS256")
-    return encoded_jwt
 
+def user_claims(user: User) -> Dict[str, Any]:
+    """Claims embedded in access tokens; role and is_active are checked against the cached user"""
+    return {"sub": user.username}
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
 
+async def get_token_claims(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
     try:
-        payload = jwt.decode(token, "your-secret-key", algorithms=["HS256"])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except Exception:
-        raise credentials_exception
-
-    user = await User.get_or_none(username=username)
+        return decode_token(token)
+    except TokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def load_user(username: str) -> User:
+    user = user_cache.get(username)
     if user is None:
-        raise credentials_exception
+        user = await User.get_or_none(username=username)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user_cache.set(username, user)
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def get_current_user(claims: Dict[str, Any] = Depends(get_token_claims)) -> User:
+    return await load_user(claims["sub"])
 
-    return user  # type: ignore
 
+async def get_admin_user(claims: Dict[str, Any] = Depends(get_token_claims)) -> User:
+    # Queryset updates and deletes, and scripts such as create_admin, change users without revoking
+    # their tokens, so role and is_active come from the users table and such changes apply within
+    # USER_CACHE_TTL
+    current_user = await load_user(claims["sub"])
 
-async def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -161,14 +251,18 @@ async def get_admin_user(current_user: User = Depends(get_current_user)) -> User
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, Any]:
-    # Initialize the database and perform migrations
-    await init_db()
+    # Initialize the ORM once and bring the schema up if needed
+    start_request_logging()
+    app.state.startup_timings = await init_db()
     yield
     # Shutdown logic (if any) would go here
+    await job_manager.shutdown()
     await Tortoise.close_connections()
+    hashing_executor.shutdown()
+    stop_request_logging()
 
 
-app = FastAPI(title="OpenChains", lifespan=lifespan)
+app = FastAPI(title="OpenChains", lifespan=lifespan, exception_handlers=tortoise_exception_handlers())
 
 # Add CORS middleware
 app.add_middleware(
@@ -180,24 +274,30 @@ app.add_middleware(
 )
 
 app.add_middleware(TimingMiddleware)
-setup_prod_app(app)
 
 
 # OAuth2 token endpoint (unified authentication endpoint)
 @app.post("/token", response_model=Token)
 async def login_for_access_token(request: LoginRequest) -> Dict[str, str]:
     user = await User.get_or_none(username=request.username)
-    if not user or not verify_password(request.password, user.password):
+    verified, new_hash = False, None
+    if user is not None:
+        verified, new_hash = await offload_hashing(verify_and_update_password, request.password, user.password)
+    if user is None or not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # The stored hash predates the current hashing policy, so upgrade it now that the password is known
+    if new_hash is not None:
+        await User.filter(id=user.id).update(password=new_hash)
+
     # Generate token
     access_token = create_access_token(
-        data={"sub": user.username},
-        expires_delta=timedelta(minutes=120),  # 2 hours
+        data=user_claims(user),
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
     return {"access_token": access_token, "token_type": "bearer"}
@@ -225,7 +325,7 @@ async def register(user: UserCreate) -> Dict[str, str]:
         )
 
     # Hash the password
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await offload_hashing(get_password_hash, user.password)
 
     # Create user with "customer" role by default
     user_obj = await User.create(username=user.username, password=hashed_password, role=user.role)
@@ -244,33 +344,115 @@ async def create_admin(admin: AdminCreate) -> Dict[str, Any]:
             detail="Username already registered",
         )
 
-    # Set role to admin
-    admin.role = "admin"
-
     # Hash the password
-    hashed_password = get_password_hash(admin.password)
+    hashed_password = await offload_hashing(get_password_hash, admin.password)
 
     # Create admin user
-    user_obj = await User.create(username=admin.username, password=hashed_password, role=admin.role)
+    user_obj = await User.create(username=admin.username, password=hashed_password, role="admin")
 
     return {"message": "Admin user created successfully", "user_id": user_obj.id}
 
 
+# Exact counts scan both tables, so they are cached briefly and concurrent refreshes share one query
+generator_counts: TTLCache[str, Dict[str, int]] = TTLCache(
+    maxsize=1, ttl=float(os.environ.get("GENERATOR_STATS_TTL", 5))
+)
+generator_counts_flight: SingleFlight[str, Dict[str, int]] = SingleFlight()
+
+
+async def count_generated_data() -> Dict[str, int]:
+    """Count users and slips exactly"""
+    return {"user_count": await User.all().count(), "slip_count": await Slip.all().count()}
+
+
+async def get_exact_generator_counts() -> Dict[str, int]:
+    counts = generator_counts.get("exact")
+    if counts is None:
+        counts = await generator_counts_flight.run("exact", count_generated_data)
+        generator_counts.set("exact", counts)
+    return counts
+
+
 @app.get("/generator/stats")
-async def get_generator_stats(admin: User = Depends(get_admin_user)) -> Dict[str, int]:
-    """Returns statistics about generated test data including user and slip counts."""
-    user_count = await User.all().count()
-    slip_count = await Slip.all().count()
+async def get_generator_stats(exact: bool = False, admin: User = Depends(get_admin_user)) -> Dict[str, Any]:
+    """
+    Returns statistics about generated test data including user and slip counts.
+
+    By default the counts are the planner's estimates, which cost no table scan.
+    Pass exact=true for real counts; they are cached for GENERATOR_STATS_TTL seconds.
+    """
+    if not exact:
+        user_estimate = await estimate_row_count(User)
+        slip_estimate = await estimate_row_count(Slip)
+        if user_estimate is not None and slip_estimate is not None:
+            return {"user_count": user_estimate, "slip_count": slip_estimate, "exact": False}
+
+    # Without planner statistics (SQLite, or tables never analyzed) fall back to exact counts
+    return {**await get_exact_generator_counts(), "exact": True}
 
-    return {"user_count": user_count, "slip_count": slip_count}
+
+async def run_generator(kind: str, workload: JobFunc, background: bool, response: Response) -> Dict[str, Any]:
+    """Run a generator workload inline, or submit it as a background job when requested"""
+    if background:
+        job = job_manager.submit(kind, workload)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return job.to_dict()
+
+    # Inline runs share the background jobs' concurrency limit, so they can't exhaust the pool either
+    return await job_manager.run(kind, workload)
 
 
 class GenerateUsersRequest(BaseModel):
     user_count: int
+    batch_size: int = GENERATOR_BATCH_SIZE
+    # Return a preview of the created users; use /generator/export/users for all of them
+    include_users: bool = True
+    # The same seed reproduces the same usernames and card numbers; a random one is used when omitted
+    seed: Optional[int] = Field(None, ge=0, le=MAX_SEED)
+
+
+async def _generate_users(request: GenerateUsersRequest, generator: DataGenerator, job: Job) -> Dict[str, Any]:
+    job.set_total(request.user_count)
+
+    # Every test user shares the same password, so hash it only once
+    hashed_password = await offload_hashing(get_password_hash, "password123")
+
+    # Insert users in batches inside a single transaction
+    async with in_transaction() as conn:
+        for batch_start in range(0, request.user_count, request.batch_size):
+            count = min(request.batch_size, request.user_count - batch_start)
+            batch = [
+                User(username=username, password=hashed_password, role="customer", card_number=card_number)
+                for username, card_number in zip(
+                    generator.usernames(batch_start, count), generator.card_numbers(batch_start, count)
+                )
+            ]
+            await User.bulk_create(batch, using_db=conn)
+            job.advance(len(batch))
+
+    result: Dict[str, Any] = {
+        "message": f"Successfully created {request.user_count} test users",
+        "users_created": request.user_count,
+        "seed": generator.seed,
+    }
+    if request.include_users:
+        # bulk_create doesn't populate ids, so read back a bounded preview of the created users
+        result["users"] = (
+            await User.filter(username__startswith=generator.username_prefix)
+            .order_by("id")
+            .limit(GENERATED_USERS_PREVIEW_LIMIT)
+            .values("id", "username", "card_number")
+        )
+    return result
 
 
 @app.post("/generator/users")
-async def generate_users(request: GenerateUsersRequest, admin: User = Depends(get_admin_user)) -> Dict[str, Any]:
+async def generate_users(
+    request: GenerateUsersRequest,
+    response: Response,
+    background: bool = False,
+    admin: User = Depends(get_admin_user),
+) -> Dict[str, Any]:
     """Generate test users for the system."""
     # Validate input
     if request.user_count <= 0:
@@ -279,30 +461,27 @@ async def generate_users(request: GenerateUsersRequest, admin: User = Depends(ge
             detail="user_count must be greater than 0",
         )
 
-    if request.user_count > 1000:
+    if request.user_count > MAX_GENERATED_USERS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="user_count must be less than or equal to 1000",
+            detail=f"user_count must be less than or equal to {MAX_GENERATED_USERS}",
         )
 
-    # Generate users
-    created_users = []
-    for i in range(request.user_count):
-        username = f"test_user_{int(time.time())}_{i}"
-        hashed_password = get_password_hash("password123")
+    if request.batch_size <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="batch_size must be greater than 0",
+        )
 
-        # Create user with randomly generated card number
-        card_number = "".join([str(random.randint(0, 9)) for _ in range(16)])
-        user = await User.create(username=username, password=hashed_password, role="customer", card_number=card_number)
-        created_users.append(user)
+    # Usernames are derived from the seed, so a seed that was already used would fail halfway on the unique constraint
+    generator = DataGenerator(request.seed)
+    if await User.filter(username__startswith=generator.username_prefix).exists():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Users for seed {generator.seed} already exist",
+        )
 
-    return {
-        "message": f"Successfully created {len(created_users)} test users",
-        "users_created": len(created_users),
-        "users": [
-            {"id": user.id, "username": user.username, "card_number": user.card_number} for user in created_users
-        ],
-    }
+    return await run_generator("users", partial(_generate_users, request, generator), background, response)
 
 
 class GenerateSlipsRequest(BaseModel):
@@ -310,16 +489,74 @@ class GenerateSlipsRequest(BaseModel):
     max_amount: float = 5000.0
     bonus_percentage: float = 5.0
     slips_per_user: int = 1
+    # "uniform", "lognormal" or "zipf" (a few cards carry most of the volume)
+    distribution: str = "uniform"
+    # The same seed over the same users reproduces the same amounts
+    seed: Optional[int] = Field(None, ge=0, le=MAX_SEED)
+
+
+async def _generate_slips(request: GenerateSlipsRequest, generator: DataGenerator, job: Job) -> Dict[str, Any]:
+    job.set_total(await User.filter(card_number__not_isnull=True).count() * request.slips_per_user)
+
+    start_time = time.perf_counter()
+
+    # Stream users in id order so memory stays bounded regardless of the user count
+    slips_created = 0
+    users_count = 0
+    last_id = 0
+    while True:
+        users_chunk = (
+            await User.filter(id__gt=last_id, card_number__not_isnull=True)
+            .order_by("id")
+            .limit(SLIP_GENERATOR_USER_CHUNK)
+            .values_list("id", "card_number")
+        )
+        if not users_chunk:
+            break
+        first_id, last_id = users_chunk[0][0], users_chunk[-1][0]
+        users_count += len(users_chunk)
+
+        # Draw every amount for the chunk in one pass, from a stream keyed by the chunk's first user
+        slip_users = [
+            (user_id, card_number) for user_id, card_number in users_chunk for _ in range(request.slips_per_user)
+        ]
+        amounts = generator.amounts(
+            [card_number for _, card_number in slip_users],
+            request.min_amount,
+            request.max_amount,
+            request.distribution,
+            key=first_id,
+        )
+        records = [(user_id, card_number, amount) for (user_id, card_number), amount in zip(slip_users, amounts)]
+        slips_created += await copy_records(Slip, ("user_id", "card_number", "amount"), records)
+        job.advance(len(records))
+
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "message": f"Successfully created {slips_created} slips",
+        "slips_created": slips_created,
+        "users_count": users_count,
+        "seed": generator.seed,
+        "elapsed_seconds": round(elapsed, 3),
+        "slips_per_second": round(slips_created / elapsed) if elapsed > 0 else slips_created,
+    }
 
 
 @app.post("/generator/slips")
-async def generate_slips(request: GenerateSlipsRequest, admin: User = Depends(get_admin_user)) -> Dict[str, Any]:
+async def generate_slips(
+    request: GenerateSlipsRequest,
+    response: Response,
+    background: bool = False,
+    admin: User = Depends(get_admin_user),
+) -> Dict[str, Any]:
     """Generate slips for existing users."""
     # Validate input
-    if request.min_amount <= 0:
+    # Amounts are drawn in whole cents, so anything below a cent would round to zero
+    if request.min_amount < 0.01:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="min_amount must be greater than 0",
+            detail="min_amount must be at least 0.01",
         )
 
     if request.max_amount <= request.min_amount:
@@ -334,83 +571,537 @@ async def generate_slips(request: GenerateSlipsRequest, admin: User = Depends(ge
             detail="slips_per_user must be greater than 0",
         )
 
-    # Get all users
-    users = await User.all()
-    if not users:
+    if request.distribution not in AMOUNT_DISTRIBUTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"distribution must be one of {', '.join(AMOUNT_DISTRIBUTIONS)}",
+        )
+
+    if not await User.all().exists():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No users found in the system",
         )
 
-    # Generate slips for each user
-    slips_created = 0
-    for user in users:
-        if not user.card_number:
-            continue  # Skip users without card numbers
+    generator = DataGenerator(request.seed)
+    return await run_generator("slips", partial(_generate_slips, request, generator), background, response)
 
-        for _ in range(request.slips_per_user):
-            # Generate random amount between min and max
-            amount = random.uniform(request.min_amount, request.max_amount)
-            amount = round(amount, 2)  # Round to 2 decimal places
 
-            # Create slip
-            await Slip.create(card_number=user.card_number, amount=amount)
-            slips_created += 1
+# Shifts card numbers around the ring of active customers ordered by id: the card held at
+# ring position p moves to position p + step. The statement must start with UPDATE (no
+# leading whitespace) so Tortoise's asyncpg client reports the affected row count.
+ROTATE_CARDS_SQL = """UPDATE users
+SET card_number = rotated.card_number
+FROM (
+    WITH ring AS (
+        SELECT id, card_number, ROW_NUMBER() OVER (ORDER BY id) - 1 AS position, COUNT(*) OVER () AS ring_size
+        FROM users
+        WHERE role = 'customer' AND is_active AND card_number IS NOT NULL
+    )
+    SELECT target.id, source.card_number
+    FROM ring AS target
+    JOIN ring AS source ON source.position = (target.position + {step}) % target.ring_size
+) AS rotated
+WHERE users.id = rotated.id
+"""
+
+# Minimum number of active customers holding a card before a rotation makes sense
+MIN_ROTATION_USERS = 6
+# Largest step the rotation statement can bind; steps wrap around the ring anyway
+MAX_ROTATION_STEP = 2**31 - 1
+
+
+async def _rotate_users(step: int, job: Job) -> Dict[str, Any]:
+    # One set-based statement in one transaction: a failed or cancelled run rolls back
+    # completely and can simply be submitted again
+    async with in_transaction() as conn:
+        placeholder = "$1" if conn.capabilities.dialect == "postgres" else "?"
+        rotated_users, _ = await conn.execute_query(ROTATE_CARDS_SQL.format(step=placeholder), [step])
+    job.set_total(rotated_users)
+    job.advance(rotated_users)
+
+    # The statement bypasses the ORM, so cached users may hold stale card numbers
+    user_cache.clear()
 
     return {
-        "message": f"Successfully created {slips_created} slips",
-        "slips_created": slips_created,
-        "users_count": len(users),
+        "message": f"Rotation completed for {rotated_users} users",
+        "rotated_users": rotated_users,
+        "step": step,
     }
 
 
 @app.post("/generator/rotate")
-async def rotate_users(admin: User = Depends(get_admin_user)) -> Dict[str, Any]:
-    """Simulate chain rotation by randomly reassigning users in the system."""
-    # Get all users
-    users = await User.all()
-    if not users or len(users) < 6:  # Need at least 6 users to perform rotation
+async def rotate_users(
+    response: Response,
+    step: int = Query(1, ge=1, le=MAX_ROTATION_STEP),
+    background: bool = False,
+    admin: User = Depends(get_admin_user),
+) -> Dict[str, Any]:
+    """Rotate card numbers across all active customers, moving each card step places along the chain."""
+    # Fetching a handful of ids is enough to check the minimum without counting the table
+    ring = User.filter(role="customer", is_active=True, card_number__not_isnull=True)
+    if len(await ring.limit(MIN_ROTATION_USERS).values_list("id", flat=True)) < MIN_ROTATION_USERS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Not enough users to perform rotation. Need at least 6 users.",
+            detail=f"Not enough users to perform rotation. Need at least {MIN_ROTATION_USERS} users.",
         )
 
-    # For now, simulate rotation - can be expanded with actual chain logic
-    rotated_users = random.sample(list(users), min(len(users) // 3, 10))
+    return await run_generator("rotate", partial(_rotate_users, step), background, response)
+
+
+async def estimate_cleanup(customers: QuerySet[User]) -> Dict[str, Any]:
+    """Estimate how many rows a cleanup removes, falling back to exact counts without planner statistics"""
+    users = await estimate_query_count(customers)
+    slips = await estimate_row_count(Slip)
+    if users is not None and slips is not None:
+        return {"users_to_remove": users, "slips_to_remove": slips, "exact": False}
+    return {"users_to_remove": await customers.count(), "slips_to_remove": await Slip.all().count(), "exact": True}
+
+
+async def delete_in_batches(query: QuerySet[Any], batch_size: int, job: Job) -> int:
+    """Delete matching rows with one short DELETE ... WHERE id IN (SELECT ... LIMIT n) per batch"""
+    removed = 0
+    while True:
+        deleted = await query.model.filter(id__in=Subquery(query.limit(batch_size).values("id"))).delete()
+        if not deleted:
+            return removed
+        removed += deleted
+        job.advance(deleted)
+
+
+async def truncate_slips() -> int:
+    """Empty the slips table in one step; the removed count is the planner estimate on PostgreSQL"""
+    conn = Slip._meta.db
+    if conn.capabilities.dialect != "postgres":
+        return await Slip.all().delete()
+
+    removed = await estimate_row_count(Slip) or 0
+    await conn.execute_script(f'TRUNCATE TABLE "{Slip._meta.db_table}"')
+    return removed
+
+
+async def _cleanup_test_data(mode: str, batch_size: int, job: Job) -> Dict[str, Any]:
+    # Consider all regular users as test users, so admins (including the caller) are kept
+    customers = User.filter(role="customer")
+    estimate = await estimate_cleanup(customers)
+    if mode == "dry_run":
+        return {"mode": mode, **estimate}
+
+    job.set_total(estimate["users_to_remove"] + estimate["slips_to_remove"])
+
+    # Every slip is test data, so the whole table can go at once
+    if mode == "truncate":
+        slips_removed = await truncate_slips()
+        job.advance(slips_removed)
+    else:
+        slips_removed = await delete_in_batches(Slip.all(), batch_size, job)
 
+    # The users table also holds admins, so customers are always deleted in batches
+    users_removed = await delete_in_batches(customers, batch_size, job)
+
+    # Bulk deletes don't fire model signals, so drop every cached user and count
+    user_cache.clear()
+    generator_counts.clear()
+
+    return {"mode": mode, "users_removed": users_removed, "slips_removed": slips_removed}
+
+
+@app.post("/generator/cleanup")
+async def cleanup_test_data(
+    response: Response,
+    mode: str = Query("batched", pattern="^(batched|truncate|dry_run)$"),
+    batch_size: int = Query(CLEANUP_BATCH_SIZE, ge=1, le=100_000),
+    background: bool = False,
+    admin: User = Depends(get_admin_user),
+) -> Dict[str, Any]:
+    """
+    Remove all test users and slips from the database, preserving only admin users.
+
+    Modes: batched deletes in short batches, truncate empties the slips table at once,
+    and dry_run only reports (estimated) counts of what would be removed.
+    """
+    return await run_generator("cleanup", partial(_cleanup_test_data, mode, batch_size), background, response)
+
+
+# Exportable tables: model, columns (never the password hash) and the order rows are streamed in
+EXPORT_TABLES: Dict[str, Tuple[Type[Model], Tuple[str, ...], Tuple[str, ...]]] = {
+    "users": (User, ("id", "username", "role", "is_active", "card_number", "created_at"), ("id",)),
+    "slips": (Slip, ("id", "user_id", "card_number", "amount", "created_at"), ("created_at", "id")),
+}
+
+
+@app.get("/generator/export/{table}")
+async def export_generated_data(
+    table: str,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = True,
+    admin: User = Depends(get_admin_user),
+) -> StreamingResponse:
+    """
+    Stream every row of users or slips as CSV or NDJSON, gzip-compressed by default.
+
+    Rows are read through a server-side cursor and encoded chunk by chunk, so memory
+    stays constant however large the table is.
+    """
+    if table not in EXPORT_TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown export {table!r}, expected one of {', '.join(EXPORT_TABLES)}",
+        )
+
+    model, columns, order_by = EXPORT_TABLES[table]
+    filename = f"{table}.{format}.gz" if gzip else f"{table}.{format}"
+    return StreamingResponse(
+        stream_export(model, columns, order_by, format, gzip),
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.get("/generator/jobs")
+async def list_generator_jobs(admin: User = Depends(get_admin_user)) -> List[Dict[str, Any]]:
+    """List recent background generator jobs."""
+    return [job.to_dict() for job in job_manager.list()]
+
+
+@app.get("/generator/jobs/{job_id}")
+async def get_generator_job(job_id: str, admin: User = Depends(get_admin_user)) -> Dict[str, Any]:
+    """Report the progress, throughput and ETA of a background generator job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+
+    return job.to_dict()
+
+
+@app.delete("/generator/jobs/{job_id}")
+async def cancel_generator_job(job_id: str, admin: User = Depends(get_admin_user)) -> Dict[str, Any]:
+    """Cancel a pending or running background generator job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+
+    if not job_manager.cancel(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Job has already finished",
+        )
+
+    return job.to_dict()
+
+
+def encode_slip_cursor(created_at: datetime, slip_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{slip_id}".encode()).decode()
+
+
+def decode_slip_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, slip_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(slip_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def serialize_slip(slip: Dict[str, Any]) -> Dict[str, Any]:
     return {
-        "message": f"Rotation completed for {len(rotated_users)} users",
-        "rotated_users": len(rotated_users),
-        "users": [{"id": user.id, "username": user.username} for user in rotated_users],
+        "id": slip["id"],
+        "user_id": slip["user_id"],
+        "card_number": slip["card_number"],
+        "amount": str(slip["amount"]),
+        "created_at": slip["created_at"].isoformat(),
     }
 
 
-@app.post("/generator/cleanup")
-async def cleanup_test_data(admin: User = Depends(get_admin_user)) -> Dict[str, int]:
-    """Remove all test users and slips from the database, preserving only admin users."""
-    # Get all non-admin users (consider all regular users as test users)
-    # We exclude the current admin user to ensure we don't delete ourselves
-    non_admin_users = await User.filter(role="customer")
-    user_ids = [user.id for user in non_admin_users]
-
-    # Delete all slips - since all slips are test data
-    slips_removed = await Slip.all().delete()
-
-    # Delete all non-admin users
-    users_removed = 0
-    if user_ids:
-        users_removed = await User.filter(id__in=user_ids).delete()
-
-    return {"users_removed": users_removed, "slips_removed": slips_removed}
-
-
-# Register Tortoise ORM
-register_tortoise(
-    app,
-    config=TORTOISE_ORM,
-    generate_schemas=False,  # Don't generate schemas - use Aerich
-    add_exception_handlers=True,
-)
+def filter_slips(
+    user_id: Optional[int],
+    card_number: Optional[str],
+    min_amount: Optional[Decimal],
+    max_amount: Optional[Decimal],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+) -> QuerySet[Slip]:
+    filters: Dict[str, Any] = {
+        "user_id": user_id,
+        "card_number": card_number,
+        "amount__gte": min_amount,
+        "amount__lte": max_amount,
+        "created_at__gte": created_from,
+        "created_at__lt": created_to,
+    }
+    return Slip.filter(**{name: value for name, value in filters.items() if value is not None})
+
+
+async def fetch_slips_page(
+    query: QuerySet[Slip], after: Optional[Tuple[datetime, int]], limit: int
+) -> List[Dict[str, Any]]:
+    """Fetch the next page newest first, continuing strictly after the (created_at, id) key"""
+    if after is not None:
+        created_at, slip_id = after
+        # The created_at bound lets the scan start at the cursor position in idx_slips_created_at_id
+        query = query.filter(created_at__lte=created_at).filter(
+            Q(created_at__lt=created_at) | Q(id__lt=slip_id),
+        )
+
+    return (
+        await query.order_by("-created_at", "-id")
+        .limit(limit)
+        .values("id", "user_id", "card_number", "amount", "created_at")
+    )
+
+
+@app.get("/slips")
+async def list_slips(
+    user_id: Optional[int] = None,
+    card_number: Optional[str] = None,
+    min_amount: Optional[Decimal] = None,
+    max_amount: Optional[Decimal] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(SLIPS_PAGE_SIZE, ge=1, le=MAX_SLIPS_PAGE_SIZE),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    admin: User = Depends(get_admin_user),
+) -> Response:
+    """
+    List slips newest first using keyset pagination, or stream every match as NDJSON.
+
+    Filter per user by user_id, which is served by the (user_id, created_at) index.
+    """
+    query = filter_slips(user_id, card_number, min_amount, max_amount, created_from, created_to)
+    after = decode_slip_cursor(cursor) if cursor else None
+
+    if format == "ndjson":
+
+        async def stream_slips() -> AsyncIterator[bytes]:
+            position = after
+            while True:
+                page = await fetch_slips_page(query, position, limit)
+                if not page:
+                    return
+                yield "".join(json.dumps(serialize_slip(slip)) + "\n" for slip in page).encode()
+                position = (page[-1]["created_at"], page[-1]["id"])
+
+        return StreamingResponse(stream_slips(), media_type="application/x-ndjson")
+
+    # Fetch one extra row to know whether another page exists
+    page = await fetch_slips_page(query, after, limit + 1)
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_slip_cursor(page[-1]["created_at"], page[-1]["id"])
+
+    return JSONResponse({"slips": [serialize_slip(slip) for slip in page], "next_cursor": next_cursor})
+
+
+def summarize_slip_stats(slip_count: int, total: Any, lowest: Any, highest: Any) -> Dict[str, Any]:
+    """Format aggregated rollup values; the backend may hand back Decimal, float or str"""
+    cents = Decimal("0.01")
+    total_amount = Decimal(str(total))
+    return {
+        "slip_count": slip_count,
+        "total_amount": str(total_amount.quantize(cents)),
+        "min_amount": str(Decimal(str(lowest)).quantize(cents)),
+        "max_amount": str(Decimal(str(highest)).quantize(cents)),
+        "avg_amount": str((total_amount / slip_count).quantize(cents)) if slip_count else "0.00",
+    }
+
+
+@app.get("/slips/stats")
+async def get_slip_stats(
+    card_number: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    granularity: str = Query("hour", pattern="^(hour|day)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    admin: User = Depends(get_admin_user),
+) -> Dict[str, Any]:
+    """Per-card totals and hourly or daily volumes, read from the hourly rollup instead of the slips table."""
+    filters: Dict[str, Any] = {
+        "card_number": card_number,
+        "bucket__gte": created_from,
+        "bucket__lt": created_to,
+    }
+    query = SlipStatHourly.filter(**{name: value for name, value in filters.items() if value is not None})
+    aggregates = {
+        "slips": Sum("slip_count"),
+        "total": Sum("total_amount"),
+        "lowest": Min("min_amount"),
+        "highest": Max("max_amount"),
+    }
+
+    cards = (
+        await query.annotate(**aggregates)
+        .group_by("card_number")
+        .order_by("-total")
+        .limit(limit)
+        .values("card_number", "slips", "total", "lowest", "highest")
+    )
+    hours = (
+        await query.annotate(**aggregates)
+        .group_by("bucket")
+        .order_by("bucket")
+        .values("bucket", "slips", "total", "lowest", "highest")
+    )
+
+    # Daily volumes are folded from the hourly rows, which keeps the read O(buckets)
+    buckets: Dict[datetime, Dict[str, Any]] = {}
+    for hour in hours:
+        bucket = hour["bucket"]
+        if granularity == "day":
+            bucket = bucket.replace(hour=0, minute=0, second=0, microsecond=0)
+        current = buckets.get(bucket)
+        if current is None:
+            buckets[bucket] = dict(hour, bucket=bucket)
+        else:
+            current["slips"] += hour["slips"]
+            current["total"] = Decimal(str(current["total"])) + Decimal(str(hour["total"]))
+            current["lowest"] = min(Decimal(str(current["lowest"])), Decimal(str(hour["lowest"])))
+            current["highest"] = max(Decimal(str(current["highest"])), Decimal(str(hour["highest"])))
+
+    return {
+        "granularity": granularity,
+        "cards": [
+            {
+                "card_number": card["card_number"],
+                **summarize_slip_stats(card["slips"], card["total"], card["lowest"], card["highest"]),
+            }
+            for card in cards
+        ],
+        "buckets": [
+            {
+                "bucket": bucket.isoformat(),
+                **summarize_slip_stats(row["slips"], row["total"], row["lowest"], row["highest"]),
+            }
+            for bucket, row in buckets.items()
+        ],
+    }
+
+
+async def write_slip_batch(rows: List[Tuple[int, Any]], result: BatchResult) -> None:
+    slips = validate_slip_rows(rows, result)
+
+    # A row pointing at a missing user would fail the whole COPY on the foreign key
+    user_ids = {slip["user_id"] for _, slip in slips if slip.get("user_id") is not None}
+    known_ids = set(await User.filter(id__in=user_ids).values_list("id", flat=True)) if user_ids else set()
+
+    records = []
+    for number, slip in slips:
+        user_id = slip.get("user_id")
+        if user_id is not None and user_id not in known_ids:
+            result.reject(number, f"user_id: User {user_id} does not exist")
+            continue
+        records.append((user_id, slip["card_number"], slip["amount"], slip["created_at"]))
+
+    result.accepted = await copy_records(Slip, ("user_id", "card_number", "amount", "created_at"), records)
+
+
+@app.post("/slips/bulk")
+async def bulk_create_slips(request: Request, admin: User = Depends(get_admin_user)) -> Dict[str, Any]:
+    """
+    Ingest slips from a JSON array, NDJSON or CSV body, chosen by Content-Type.
+
+    Rows are validated and written with COPY in batches of SLIP_INGEST_BATCH_SIZE.
+    Each batch commits on its own, so invalid rows are reported per batch without
+    failing the rest of the upload.
+    """
+    fmt = detect_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content-Type must be application/json, application/x-ndjson or text/csv",
+        )
+
+    start_time = time.perf_counter()
+    batches: List[BatchResult] = []
+    pending: List[Tuple[int, Any]] = []
+
+    async def flush() -> None:
+        result = BatchResult(len(batches) + 1)
+        await write_slip_batch(pending, result)
+        batches.append(result)
+        pending.clear()
+
+    try:
+        async for row in iter_rows(fmt, request.stream()):
+            pending.append(row)
+            if len(pending) >= SLIP_INGEST_BATCH_SIZE:
+                await flush()
+    except RowError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if pending:
+        await flush()
+
+    elapsed = time.perf_counter() - start_time
+    accepted = sum(batch.accepted for batch in batches)
+    return {
+        "accepted": accepted,
+        "rejected": sum(batch.rejected for batch in batches),
+        "batches": [batch.to_dict() for batch in batches],
+        "elapsed_seconds": round(elapsed, 3),
+        "slips_per_second": round(accepted / elapsed) if elapsed > 0 else accepted,
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request) -> PlainTextResponse:
+    """Expose request, hashing, cache and database metrics in the Prometheus text format."""
+    writer = MetricsWriter()
+
+    for phase, seconds in getattr(request.app.state, "startup_timings", {}).items():
+        writer.gauge("startup_phase_seconds", "Time spent in each startup phase", seconds, {"phase": phase})
+
+    for (method, route, status_code), histogram in request_metrics.histograms.items():
+        writer.histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route template and status code",
+            histogram,
+            {"method": method, "route": route, "status": status_code},
+        )
+
+    hashing_stats = hashing_executor.stats()
+    writer.gauge("password_hashing_pending", "Hashing calls queued or running", hashing_stats["pending"])
+    writer.gauge("password_hashing_workers", "Hashing executor worker count", hashing_stats["workers"])
+    for outcome in ("submitted", "completed", "failed", "rejected"):
+        writer.counter(
+            "password_hashing_calls_total", "Hashing calls by outcome", hashing_stats[outcome], {"outcome": outcome}
+        )
+    writer.histogram(
+        "password_hashing_duration_seconds", "Hashing call latency including queueing", hashing_executor.duration
+    )
+
+    writer.counter("user_cache_hits_total", "Authenticated user cache hits", user_cache.hits)
+    writer.counter("user_cache_misses_total", "Authenticated user cache misses", user_cache.misses)
+    writer.gauge("user_cache_size", "Authenticated user cache entries", len(user_cache))
+
+    for conn in connections.all():
+        pool = getattr(conn, "_pool", None)
+        if pool is None or not hasattr(pool, "get_size"):
+            continue
+        labels = {"connection": conn.connection_name}
+        writer.gauge("db_pool_size", "Open connections in the pool", pool.get_size(), labels)
+        writer.gauge("db_pool_idle", "Idle connections in the pool", pool.get_idle_size(), labels)
+        writer.gauge(
+            "db_pool_in_use", "Connections checked out of the pool", pool.get_size() - pool.get_idle_size(), labels
+        )
+        writer.gauge("db_pool_max_size", "Maximum pool size", pool.get_max_size(), labels)
+
+    for verb, histogram in query_metrics.histograms.items():
+        writer.histogram(
+            "db_query_duration_seconds", "Database query latency by statement", histogram, {"statement": verb}
+        )
+    writer.counter("db_query_errors_total", "Database queries that raised an error", query_metrics.errors)
+
+    return PlainTextResponse(writer.render(), media_type="text/plain; version=0.0.4")
+
 
 # For running directly with uvicorn
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+# backend/app/metrics.py
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+# Latency buckets in seconds, upper bounds inclusive
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.
+
+    Observations only come from the event loop thread, so plain integer
+    increments are enough and no locking is needed.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        # One extra slot for observations above the largest bucket (+Inf)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> List[int]:
+        """Return counts per bucket including all lower buckets, ending with +Inf"""
+        total = 0
+        cumulative = []
+        for bucket_count in self.counts:
+            total += bucket_count
+            cumulative.append(total)
+        return cumulative
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls into"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, cumulative in zip(self.buckets, self.cumulative_counts()):
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+
+RequestKey = Tuple[str, str, int]
+
+
+class RequestMetrics:
+    """Request latency histograms keyed by method, route template and status code"""
+
+    def __init__(self) -> None:
+        self.histograms: Dict[RequestKey, Histogram] = {}
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        key = (method, route, status_code)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+
+class QueryMetrics:
+    """Query duration histograms keyed by statement verb, fed by asyncpg's query logger"""
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, Histogram] = {}
+        self.errors = 0
+
+    def log_query(self, record: Any) -> None:
+        """Callback for asyncpg Connection.add_query_logger"""
+        words = record.query.split(None, 1)
+        verb = words[0].upper() if words else "UNKNOWN"
+        histogram = self.histograms.get(verb)
+        if histogram is None:
+            histogram = self.histograms[verb] = Histogram()
+        histogram.observe(record.elapsed)
+        if record.exception is not None:
+            self.errors += 1
+
+
+async def instrument_connection(conn: Any) -> None:
+    """Pool init hook that records the duration of every query on the connection"""
+    conn.add_query_logger(query_metrics.log_query)
+
+
+def _format_labels(labels: Optional[Dict[str, Any]]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{0}="{1}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsWriter:
+    """Builds a response in the Prometheus text exposition format"""
+
+    def __init__(self) -> None:
+        self._lines: List[str] = []
+        self._declared: Set[str] = set()
+
+    def _declare(self, name: str, metric_type: str, help_text: str) -> None:
+        if name not in self._declared:
+            self._declared.add(name)
+            self._lines.append(f"# HELP {name} {help_text}")
+            self._lines.append(f"# TYPE {name} {metric_type}")
+
+    def counter(self, name: str, help_text: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        self._declare(name, "counter", help_text)
+        self._lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def gauge(self, name: str, help_text: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        self._declare(name, "gauge", help_text)
+        self._lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def histogram(
+        self, name: str, help_text: str, histogram: Histogram, labels: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self._declare(name, "histogram", help_text)
+        labels = labels or {}
+        bounds = [*histogram.buckets, float("inf")]
+        for bound, cumulative in zip(bounds, histogram.cumulative_counts()):
+            bucket_labels = {**labels, "le": _format_value(bound)}
+            self._lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+        self._lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+        self._lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+query_metrics = QueryMetrics()
@@ -0,0 +1,101 @@
+# backend/app/middleware.py
+import logging
+import os
+import queue
+import random
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.metrics import RequestMetrics, request_metrics
+
+request_logger = logging.getLogger("openchains.requests")
+
+_log_listener: Optional[QueueListener] = None
+_log_handler: Optional[QueueHandler] = None
+
+
+def start_request_logging() -> None:
+    """Route request log records through a queue so the event loop never blocks on stdout"""
+    global _log_listener, _log_handler
+    if _log_listener is not None:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _log_handler = QueueHandler(log_queue)
+    request_logger.addHandler(_log_handler)
+    request_logger.setLevel(logging.INFO)
+    request_logger.propagate = False
+
+    _log_listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    _log_listener.start()
+
+
+def stop_request_logging() -> None:
+    global _log_listener, _log_handler
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+    # Remove the handler too, or every start/stop cycle would add another one and duplicate lines
+    if _log_handler is not None:
+        request_logger.removeHandler(_log_handler)
+        _log_handler = None
+
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware that times requests.
+
+    It adds the X-Process-Time header, records latency per route template and
+    status code, and logs a sample of requests (every server error is logged).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        metrics: RequestMetrics = request_metrics,
+        log_sample_rate: Optional[float] = None,
+    ) -> None:
+        self.app = app
+        self.metrics = metrics
+        if log_sample_rate is None:
+            log_sample_rate = float(os.environ.get("REQUEST_LOG_SAMPLE_RATE", 0.01))
+        self.log_sample_rate = log_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter_ns()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter_ns() - start_time) / 1_000_000
+                MutableHeaders(scope=message).append("X-Process-Time", f"{elapsed_ms:.2f}ms")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration_ns = time.perf_counter_ns() - start_time
+
+            # Use the matched route template, so path parameters don't explode the label set
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            self.metrics.observe(scope["method"], route, status_code, duration_ns / 1_000_000_000)
+
+            if status_code >= 500 or random.random() < self.log_sample_rate:
+                request_logger.info(
+                    "Request: %s %s - Status: %d - Time: %.2fms",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    duration_ns / 1_000_000,
+                )
@@ -0,0 +1,160 @@
+# backend/app/partitions.py
+import os
+import re
+from datetime import UTC, date, datetime
+from typing import List, Optional
+
+from tortoise import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+SLIPS_TABLE = "slips"
+DEFAULT_PARTITION = f"{SLIPS_TABLE}_default"
+SLIP_PARTITION_MONTHS_AHEAD = int(os.environ.get("SLIP_PARTITION_MONTHS_AHEAD", 3))
+
+# Monthly partitions are named slips_yYYYYmMM; the default partition doesn't match
+PARTITION_NAME_PATTERN = re.compile(r"^slips_y(\d{4})m(\d{2})$")
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_start(month: date) -> datetime:
+    """Return midnight UTC on the first day of the month, the lower bound of its partition"""
+    return datetime(month.year, month.month, 1, tzinfo=UTC)
+
+
+def partition_name(month: date) -> str:
+    return f"{SLIPS_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Return the first day of the month a partition covers, or None for the default partition"""
+    match = PARTITION_NAME_PATTERN.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+async def is_partitioned(conn: BaseDBAsyncClient) -> bool:
+    """Check whether slips is a partitioned table; it is a plain table on SQLite and before the migration"""
+    if conn.capabilities.dialect != "postgres":
+        return False
+    _, rows = await conn.execute_query(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass($1::text)", [SLIPS_TABLE]
+    )
+    return bool(rows)
+
+
+async def list_slip_partitions(conn: BaseDBAsyncClient) -> List[str]:
+    _, rows = await conn.execute_query(
+        """
+        SELECT child.relname AS name
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass($1::text)
+        ORDER BY child.relname
+        """,
+        [SLIPS_TABLE],
+    )
+    return [row["name"] for row in rows]
+
+
+async def ensure_slip_partitions(
+    conn: BaseDBAsyncClient, months_ahead: int = SLIP_PARTITION_MONTHS_AHEAD, today: Optional[date] = None
+) -> List[str]:
+    """
+    Create the monthly partitions from the current month through months_ahead months ahead.
+
+    Partitions are created before rows arrive, so inserts never fall into the
+    default partition. Existing partitions are left alone.
+
+    Returns:
+        Names of the partitions that were created
+    """
+    if not await is_partitioned(conn):
+        return []
+
+    existing = set(await list_slip_partitions(conn))
+    current = (today or date.today()).replace(day=1)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        await create_slip_partition(conn, month, has_default=DEFAULT_PARTITION in existing)
+        created.append(name)
+    return created
+
+
+async def create_slip_partition(conn: BaseDBAsyncClient, month: date, has_default: bool = True) -> None:
+    """
+    Create the partition for one month.
+
+    Postgres refuses to create a partition while the default partition holds rows in
+    its range, which happens once slips are inserted for a month ahead of the partition
+    manager. Those rows are moved in one transaction: the default partition is detached,
+    the new partition created, the rows moved across and the default attached again.
+    Statement triggers on slips don't fire for the move, so the hourly rollup is unchanged.
+    """
+    name = partition_name(month)
+    lower, upper = month_start(month), month_start(add_months(month, 1))
+    create_sql = (
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{SLIPS_TABLE}" '
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+
+    has_stray_rows = False
+    if has_default:
+        _, rows = await conn.execute_query(
+            f'SELECT 1 FROM "{DEFAULT_PARTITION}" WHERE created_at >= $1 AND created_at < $2 LIMIT 1', [lower, upper]
+        )
+        has_stray_rows = bool(rows)
+    if not has_stray_rows:
+        await conn.execute_script(create_sql)
+        return
+
+    async with in_transaction(conn.connection_name) as tx:
+        await tx.execute_script(f'ALTER TABLE "{SLIPS_TABLE}" DETACH PARTITION "{DEFAULT_PARTITION}"')
+        await tx.execute_script(create_sql)
+        await tx.execute_query(
+            f"""
+            WITH moved AS (
+                DELETE FROM "{DEFAULT_PARTITION}" WHERE created_at >= $1 AND created_at < $2 RETURNING *
+            )
+            INSERT INTO "{name}" SELECT * FROM moved
+            """,
+            [lower, upper],
+        )
+        await tx.execute_script(f'ALTER TABLE "{SLIPS_TABLE}" ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT')
+
+
+async def drop_slip_partitions_before(conn: BaseDBAsyncClient, cutoff: date) -> List[str]:
+    """
+    Drop every monthly partition that ends on or before the month of cutoff.
+
+    Dropping a partition is a catalog change, so retention is instant however many rows
+    it holds. The hourly rollup rows of a dropped month are removed with it.
+
+    Returns:
+        Names of the partitions that were dropped
+    """
+    if not await is_partitioned(conn):
+        return []
+
+    cutoff_month = cutoff.replace(day=1)
+    dropped = []
+    for name in await list_slip_partitions(conn):
+        month = partition_month(name)
+        if month is None or add_months(month, 1) > cutoff_month:
+            continue
+        async with in_transaction(conn.connection_name) as tx:
+            await tx.execute_script(f'DROP TABLE "{name}"')
+            await tx.execute_query(
+                "DELETE FROM slip_stats_hourly WHERE bucket >= $1 AND bucket < $2",
+                [month_start(month), month_start(add_months(month, 1))],
+            )
+        dropped.append(name)
+    return dropped
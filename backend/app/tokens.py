@@ -0,0 +1,147 @@
+# backend/app/tokens.py
+import os
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from jose import jwk, jws, jwt
+from jose.backends.base import Key
+from jose.exceptions import JOSEError
+
+from backend.app.cache import TTLCache
+
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", 120))
+
+# Used when SECRET_KEY isn't set, so existing deployments keep accepting their tokens
+DEFAULT_SECRET_KEY = "your-secret-key"
+DEFAULT_KEY_ID = "default"
+
+
+class TokenError(Exception):
+    """Raised when a token is malformed, expired, signed with an unknown key or revoked"""
+
+
+class SigningKeys:
+    """HMAC keys by key id, constructed once so signing and verifying skip key parsing"""
+
+    def __init__(self, current_kid: str, secrets: Dict[str, str], algorithm: str = ALGORITHM) -> None:
+        if current_kid not in secrets:
+            raise ValueError(f"No secret configured for the current key id {current_kid!r}")
+        self.current_kid = current_kid
+        self.algorithm = algorithm
+        self._keys: Dict[str, Key] = {kid: jwk.construct(secret, algorithm) for kid, secret in secrets.items()}
+
+    def current(self) -> Tuple[str, Key]:
+        return self.current_kid, self._keys[self.current_kid]
+
+    def get(self, kid: str) -> Optional[Key]:
+        return self._keys.get(kid)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def parse_key_list(value: str) -> Dict[str, str]:
+    """Parse "kid=secret,kid=secret" into a dict; secrets may contain "=" but not ","."""
+    keys = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        kid, separator, secret = item.strip().partition("=")
+        if not separator or not kid or not secret:
+            raise ValueError(f"Invalid signing key entry {item!r}, expected kid=secret")
+        keys[kid] = secret
+    return keys
+
+
+def create_signing_keys() -> SigningKeys:
+    """
+    Build the signing keys from the environment.
+
+    New tokens are signed with SECRET_KEY under the key id JWT_KEY_ID. Retired
+    keys listed in JWT_PREVIOUS_KEYS still verify, so tokens issued before a key
+    rotation stay valid until they expire.
+    """
+    current_kid = os.environ.get("JWT_KEY_ID", DEFAULT_KEY_ID)
+    secrets = parse_key_list(os.environ.get("JWT_PREVIOUS_KEYS", ""))
+    secrets[current_kid] = os.environ.get("SECRET_KEY", DEFAULT_SECRET_KEY)
+    return SigningKeys(current_kid, secrets)
+
+
+signing_keys = create_signing_keys()
+
+
+def token_version() -> int:
+    """Microseconds since the epoch; tokens carry it as "ver" and revocations compare against it"""
+    return time.time_ns() // 1000
+
+
+class TokenRevocations:
+    """
+    Per-user cutoffs that reject tokens minted before them.
+
+    Entries only need to outlive the tokens they reject, so they expire after the
+    token lifetime and the table stays small. The table is per process: with several
+    workers, a revocation only applies in the worker that recorded it.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._cutoffs: TTLCache[str, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def revoke(self, subject: str) -> None:
+        self._cutoffs.set(subject, token_version())
+
+    def is_revoked(self, subject: str, version: int) -> bool:
+        cutoff = self._cutoffs.get(subject)
+        return cutoff is not None and version < cutoff
+
+    def clear(self) -> None:
+        self._cutoffs.clear()
+
+    def __len__(self) -> int:
+        return len(self._cutoffs)
+
+
+token_revocations = TokenRevocations(
+    maxsize=int(os.environ.get("TOKEN_REVOCATION_SIZE", 100000)),
+    ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
+def encode_token(claims: Dict[str, Any], expires_delta: timedelta, keys: Optional[SigningKeys] = None) -> str:
+    """Sign claims with the current key, adding "exp", the "ver" version claim and a "kid" header"""
+    keys = keys or signing_keys
+    kid, key = keys.current()
+    to_encode = {**claims, "exp": datetime.now(UTC) + expires_delta, "ver": token_version()}
+    encoded_jwt: str = jwt.encode(to_encode, key, algorithm=keys.algorithm, headers={"kid": kid})
+    return encoded_jwt
+
+
+def decode_token(token: str, keys: Optional[SigningKeys] = None) -> Dict[str, Any]:
+    """
+    Verify a token and return its claims.
+
+    The key is chosen by the "kid" header; tokens without one predate key ids and
+    are checked against the current key.
+
+    Raises:
+        TokenError: If the token can't be verified, has no subject or was revoked
+    """
+    keys = keys or signing_keys
+    try:
+        kid = jws.get_unverified_header(token).get("kid", keys.current_kid)
+        key = keys.get(kid)
+        if key is None:
+            raise TokenError(f"Unknown signing key {kid!r}")
+        claims: Dict[str, Any] = jwt.decode(token, key, algorithms=[keys.algorithm])
+    except JOSEError as exc:
+        raise TokenError(str(exc)) from exc
+
+    subject, version = claims.get("sub"), claims.get("ver", 0)
+    if not isinstance(subject, str) or not isinstance(version, int):
+        raise TokenError("Token has no subject or an invalid version")
+    # Tokens without a version predate revocation support, so any cutoff rejects them
+    if token_revocations.is_revoked(subject, version):
+        raise TokenError("Token was revoked")
+    return claims
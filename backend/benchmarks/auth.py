@@ -0,0 +1,280 @@
+# backend/benchmarks/auth.py
+import argparse
+import asyncio
+import inspect
+import json
+import statistics
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NoReturn, Optional, Union
+
+from passlib.context import CryptContext
+from tortoise import Tortoise
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.app import hashing  # noqa: E402
+from backend.app.hashing import (  # noqa: E402
+    argon2_available,
+    build_password_context,
+    create_password_context,
+    get_password_hash,
+    hashing_executor,
+    verify_and_update_password,
+)
+from backend.app.main import (  # noqa: E402
+    User,
+    create_access_token,
+    get_admin_user,
+    get_current_user,
+    user_cache,
+    user_claims,
+)
+from backend.app.tokens import decode_token  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "auth_baseline.json"
+PASSWORD = "password123"
+
+# Every case is compared as a multiple of this one, and may grow by the tolerance (2.0 allows 3x)
+CALIBRATION_CASE = "calibration"
+DEFAULT_TOLERANCE = 2.0
+
+# Claims added on top of "sub" to measure how token size affects encode and decode
+PAYLOADS: Dict[str, Dict[str, str]] = {
+    "small": {},
+    "medium": {f"claim_{i}": f"value_{i}" for i in range(8)},
+    "large": {f"claim_{i}": "x" * 32 for i in range(32)},
+}
+
+BenchFunc = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+class MicroBenchmark:
+    """A named operation timed over several rounds of a fixed number of calls"""
+
+    def __init__(self, name: str, func: BenchFunc, rounds: int = 20, iterations: int = 100) -> None:
+        self.name = name
+        self.func = func
+        self.rounds = rounds
+        self.iterations = iterations
+
+    async def run(self) -> Dict[str, Any]:
+        is_async = inspect.iscoroutinefunction(self.func)
+
+        # One untimed call warms caches and lazy imports
+        if is_async:
+            await self.func()
+        else:
+            self.func()
+
+        per_call: List[float] = []
+        for _ in range(self.rounds):
+            start_time = time.perf_counter()
+            for _ in range(self.iterations):
+                if is_async:
+                    await self.func()
+                else:
+                    self.func()
+            per_call.append((time.perf_counter() - start_time) / self.iterations)
+
+        median = statistics.median(per_call)
+        return {
+            "median_ms": round(median * 1000, 4),
+            "mean_ms": round(statistics.fmean(per_call) * 1000, 4),
+            "min_ms": round(min(per_call) * 1000, 4),
+            "max_ms": round(max(per_call) * 1000, 4),
+            "stddev_ms": round(statistics.pstdev(per_call) * 1000, 4),
+            "ops_per_second": round(1 / median, 1) if median else 0.0,
+            "rounds": self.rounds,
+            "iterations": self.iterations,
+        }
+
+
+def with_policy(context: CryptContext, func: Callable[..., Any], *args: Any) -> Any:
+    """Call an app hashing helper with context installed as the hashing policy"""
+    previous, hashing.pwd_context = hashing.pwd_context, context
+    try:
+        return func(*args)
+    finally:
+        hashing.pwd_context = previous
+
+
+def hashing_benchmarks(cost_factors: List[int]) -> List[MicroBenchmark]:
+    benchmarks = []
+    for rounds in cost_factors:
+        context = build_password_context(bcrypt_rounds=rounds)
+        hashed = context.hash(PASSWORD)
+        # bcrypt doubles in cost per round, so fewer calls are timed at higher cost factors
+        iterations = max(1, 2 ** max(0, 10 - rounds))
+        hash_call = partial(with_policy, context, get_password_hash, PASSWORD)
+        verify_call = partial(with_policy, context, verify_and_update_password, PASSWORD, hashed)
+        benchmarks.append(MicroBenchmark(f"hash_bcrypt_{rounds}", hash_call, 5, iterations))
+        benchmarks.append(MicroBenchmark(f"verify_bcrypt_{rounds}", verify_call, 5, iterations))
+
+    # argon2id with the ARGON2_* settings from the environment, when its backend is installed
+    if argon2_available():
+        context = create_password_context().copy(default="argon2")
+        hashed = context.hash(PASSWORD)
+        benchmarks.append(
+            MicroBenchmark("hash_argon2id", partial(with_policy, context, get_password_hash, PASSWORD), 5, 1)
+        )
+        benchmarks.append(
+            MicroBenchmark(
+                "verify_argon2id", partial(with_policy, context, verify_and_update_password, PASSWORD, hashed), 5, 1
+            )
+        )
+
+    # The /register path: the configured policy on the hashing executor, including its queueing
+    async def hash_on_executor() -> str:
+        return await hashing_executor.run(get_password_hash, PASSWORD)
+
+    benchmarks.append(MicroBenchmark("hash_executor", hash_on_executor, 5, 1))
+    return benchmarks
+
+
+def jwt_benchmarks() -> List[MicroBenchmark]:
+    benchmarks = []
+    for size, claims in PAYLOADS.items():
+        data = {"sub": "benchmark_user", **claims}
+        token = create_access_token(data)
+        benchmarks.append(MicroBenchmark(f"jwt_encode_{size}", partial(create_access_token, data)))
+        benchmarks.append(MicroBenchmark(f"jwt_decode_{size}", partial(decode_token, token)))
+    return benchmarks
+
+
+async def user_lookup_benchmarks() -> List[MicroBenchmark]:
+    username = f"benchmark_user_{int(time.time())}"
+    user = await User.create(username=username, password="hashed", role="customer")
+    admin = await User.create(username=f"{username}_admin", password="hashed", role="admin")
+    token = create_access_token(user_claims(user))
+    admin_token = create_access_token(user_claims(admin))
+
+    async def cache_hit() -> None:
+        await get_current_user(decode_token(token))
+
+    async def cache_miss() -> None:
+        user_cache.invalidate(username)
+        await get_current_user(decode_token(token))
+
+    async def admin_cache_hit() -> None:
+        await get_admin_user(decode_token(admin_token))
+
+    return [
+        MicroBenchmark("get_current_user_cached", cache_hit),
+        MicroBenchmark("get_current_user_db", cache_miss),
+        MicroBenchmark("get_admin_user_cached", admin_cache_hit),
+    ]
+
+
+def calibration_loop() -> int:
+    """Fixed pure-Python work that every other case is measured against"""
+    total = 0
+    for value in range(20000):
+        total += value * value % 7
+    return total
+
+
+def add_ratios(results: Dict[str, Dict[str, Any]]) -> None:
+    """Express every median as a multiple of the calibration median measured in the same run"""
+    reference = results[CALIBRATION_CASE]["median_ms"]
+    for result in results.values():
+        result["ratio"] = round(result["median_ms"] / reference, 4) if reference else 0.0
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Return a message for every case whose ratio exceeds its baseline by more than the tolerance.
+
+    Ratios to the calibration loop cancel out most of the speed difference between machines,
+    so a baseline recorded on one machine still holds on another.
+    """
+    tolerance = baseline.get("tolerance", DEFAULT_TOLERANCE)
+    regressions = []
+    for name, threshold in baseline["cases"].items():
+        result = results.get(name)
+        if result is None or name == CALIBRATION_CASE:
+            continue
+        limit = threshold["ratio"] * (1 + tolerance)
+        if result["ratio"] > limit:
+            regressions.append(f"{name}: {result['ratio']}x the calibration loop exceeds {limit:.4f}x")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time auth primitives and compare them against a baseline")
+    parser.add_argument("--cost-factors", default="10,12", help="Comma separated bcrypt cost factors")
+    parser.add_argument("--database-url", default="sqlite://:memory:", help="Database for the user lookup cases")
+    parser.add_argument("--compare", nargs="?", const=str(BASELINE_PATH), help="Baseline file to compare against")
+    parser.add_argument("--save-baseline", nargs="?", const=str(BASELINE_PATH), help="Write results as a baseline")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    return parser.parse_args()
+
+
+async def run_benchmarks(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    cost_factors = [int(value) for value in args.cost_factors.split(",") if value.strip()]
+
+    await Tortoise.init(db_url=args.database_url, modules={"models": ["backend.app.main"]})
+    try:
+        await Tortoise.generate_schemas(safe=True)
+        benchmarks = [MicroBenchmark(CALIBRATION_CASE, calibration_loop, 20, 20)]
+        benchmarks += hashing_benchmarks(cost_factors) + jwt_benchmarks() + await user_lookup_benchmarks()
+
+        results = {}
+        for benchmark in benchmarks:
+            print(f"Running {benchmark.name}...", file=sys.stderr)
+            results[benchmark.name] = await benchmark.run()
+        add_ratios(results)
+        return results
+    finally:
+        await Tortoise.close_connections()
+        hashing_executor.shutdown()
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, Any]], previous: Optional[Dict[str, Any]]) -> None:
+    baseline = {
+        "tolerance": (previous or {}).get("tolerance", DEFAULT_TOLERANCE),
+        # median_ms only documents the machine the baseline was recorded on; comparisons use ratio
+        "cases": {
+            name: {"ratio": result["ratio"], "median_ms": result["median_ms"]} for name, result in results.items()
+        },
+    }
+    Path(path).write_text(json.dumps(baseline, indent=2) + "\n")
+    print(f"Baseline written to {path}", file=sys.stderr)
+
+
+async def main() -> int:
+    """Run the micro-benchmarks; returns 1 when a case regressed against the baseline"""
+    args = parse_args()
+    results = await run_benchmarks(args)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.save_baseline:
+        previous = json.loads(Path(args.save_baseline).read_text()) if Path(args.save_baseline).exists() else None
+        save_baseline(args.save_baseline, results, previous)
+
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text()))
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against the baseline", file=sys.stderr)
+
+    return 0
+
+
+def main_wrapper() -> NoReturn:
+    """Wrapper for Poetry scripts"""
+    sys.exit(asyncio.run(main()))
+
+
+if __name__ == "__main__":
+    main_wrapper()
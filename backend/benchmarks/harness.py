@@ -0,0 +1,168 @@
+# backend/benchmarks/harness.py
+import asyncio
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# One request of a scenario; returns the response so its status can be recorded
+RequestFunc = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class LoadResult:
+    """Latencies and status codes collected while running one scenario"""
+
+    def __init__(self, name: str, concurrency: int) -> None:
+        self.name = name
+        self.concurrency = concurrency
+        self.latencies: List[float] = []
+        self.status_codes: "Counter[str]" = Counter()
+        self.errors = 0
+        self.duration = 0.0
+        # Scenario-specific figures merged into the report, such as rows per second
+        self.extra: Dict[str, Any] = {}
+
+    def record(self, seconds: float, status_code: Optional[int]) -> None:
+        self.latencies.append(seconds)
+        if status_code is None or status_code >= 400:
+            self.errors += 1
+        self.status_codes[str(status_code) if status_code is not None else "error"] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        requests = len(latencies)
+        return {
+            "concurrency": self.concurrency,
+            "requests": requests,
+            "errors": self.errors,
+            "status_codes": dict(self.status_codes),
+            "duration_seconds": round(self.duration, 3),
+            "throughput_rps": round(requests / self.duration, 2) if self.duration > 0 else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50) * 1000, 2),
+                "p95": round(percentile(latencies, 0.95) * 1000, 2),
+                "p99": round(percentile(latencies, 0.99) * 1000, 2),
+                "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+                "mean": round(sum(latencies) / requests * 1000, 2) if requests else 0.0,
+            },
+            **self.extra,
+        }
+
+
+async def run_load(
+    name: str,
+    client: httpx.AsyncClient,
+    request: RequestFunc,
+    concurrency: int,
+    requests: Optional[int] = None,
+    duration: Optional[float] = None,
+) -> LoadResult:
+    """
+    Drive request from concurrency workers until requests calls were made or duration seconds passed.
+
+    Args:
+        name: Scenario name used in the report
+        client: Client to send requests with
+        request: Sends one request
+        concurrency: Number of concurrent workers
+        requests: Total number of requests across all workers
+        duration: Seconds to keep sending requests
+
+    Returns:
+        The collected latencies and status codes
+    """
+    if requests is None and duration is None:
+        raise ValueError("Either requests or duration is required")
+
+    result = LoadResult(name=name, concurrency=concurrency)
+    remaining = requests
+    start_time = time.perf_counter()
+    deadline = start_time + duration if duration is not None else None
+
+    async def worker() -> None:
+        nonlocal remaining
+        while deadline is None or time.perf_counter() < deadline:
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+
+            request_start = time.perf_counter()
+            try:
+                response = await request(client)
+                status_code: Optional[int] = response.status_code
+            except httpx.HTTPError:
+                status_code = None
+            result.record(time.perf_counter() - request_start, status_code)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.duration = time.perf_counter() - start_time
+    return result
+
+
+def find_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+async def start_server(database_url: str, port: int, workers: int = 1) -> subprocess.Popen:
+    """Start the app with uvicorn in a subprocess and wait until it answers"""
+    env = {**os.environ, "DATABASE_URL": database_url}
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=PROJECT_ROOT,
+        env=env,
+    )
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        for _ in range(300):
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode}")
+            try:
+                await client.get("/docs")
+                return process
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+
+    process.terminate()
+    raise RuntimeError("Server did not start within 30 seconds")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
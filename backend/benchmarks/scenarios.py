@@ -0,0 +1,137 @@
+# backend/benchmarks/scenarios.py
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from backend.benchmarks.harness import LoadResult, run_load
+
+# Every user created by /generator/users shares this password
+GENERATED_USER_PASSWORD = "password123"
+
+
+def bearer(token: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    response = await client.post("/token", json={"username": username, "password": password})
+    response.raise_for_status()
+    token: str = response.json()["access_token"]
+    return token
+
+
+class BenchmarkContext:
+    """Accounts prepared before the scenarios run"""
+
+    def __init__(self, admin_token: str, usernames: List[str]) -> None:
+        self.admin_token = admin_token
+        self.usernames = usernames
+
+
+async def prepare(
+    client: httpx.AsyncClient, admin_username: str, admin_password: str, user_count: int
+) -> BenchmarkContext:
+    """Create the admin account if needed, then generate customers and a few slips for them to read"""
+    response = await client.post("/create-admin", json={"username": admin_username, "password": admin_password})
+    if response.status_code == 400:
+        print(f"Admin {admin_username} already exists, logging in", file=sys.stderr)
+    else:
+        response.raise_for_status()
+    admin_token = await login(client, admin_username, admin_password)
+
+    response = await client.post("/generator/users", json={"user_count": user_count}, headers=bearer(admin_token))
+    response.raise_for_status()
+    usernames = [user["username"] for user in response.json()["users"]]
+
+    response = await client.post(
+        "/generator/slips",
+        json={"min_amount": 1.0, "max_amount": 100.0, "slips_per_user": 5},
+        headers=bearer(admin_token),
+    )
+    response.raise_for_status()
+
+    return BenchmarkContext(admin_token, usernames)
+
+
+async def login_storm(
+    client: httpx.AsyncClient,
+    context: BenchmarkContext,
+    concurrency: int,
+    requests: Optional[int] = None,
+    duration: Optional[float] = None,
+) -> LoadResult:
+    """Many users logging in at once; bounded by password hashing"""
+
+    async def request(client: httpx.AsyncClient) -> httpx.Response:
+        username = random.choice(context.usernames)
+        return await client.post("/token", json={"username": username, "password": GENERATED_USER_PASSWORD})
+
+    return await run_load("login_storm", client, request, concurrency, requests, duration)
+
+
+async def read_mix(
+    client: httpx.AsyncClient,
+    context: BenchmarkContext,
+    concurrency: int,
+    requests: Optional[int] = None,
+    duration: Optional[float] = None,
+) -> LoadResult:
+    """Authenticated reads: 70% /users/me, 20% a page of /slips and 10% /generator/stats"""
+    user_tokens = [
+        await login(client, username, GENERATED_USER_PASSWORD) for username in context.usernames[: max(concurrency, 1)]
+    ]
+    admin_headers = bearer(context.admin_token)
+
+    async def request(client: httpx.AsyncClient) -> httpx.Response:
+        roll = random.random()
+        if roll < 0.7:
+            return await client.get("/users/me", headers=bearer(random.choice(user_tokens)))
+        if roll < 0.9:
+            return await client.get("/slips", params={"limit": 50}, headers=admin_headers)
+        return await client.get("/generator/stats", headers=admin_headers)
+
+    return await run_load("read_mix", client, request, concurrency, requests, duration)
+
+
+async def generator_bulk(
+    client: httpx.AsyncClient,
+    context: BenchmarkContext,
+    rounds: int,
+    users_per_round: int,
+    slips_per_user: int,
+) -> LoadResult:
+    """Sequential generator rounds, reporting rows written per second"""
+    result = LoadResult(name="generator_bulk", concurrency=1)
+    headers = bearer(context.admin_token)
+    users_created = slips_created = 0
+    start_time = time.perf_counter()
+
+    for _ in range(rounds):
+        request_start = time.perf_counter()
+        response = await client.post(
+            "/generator/users", json={"user_count": users_per_round, "include_users": False}, headers=headers
+        )
+        result.record(time.perf_counter() - request_start, response.status_code)
+        if response.is_success:
+            users_created += response.json()["users_created"]
+
+        request_start = time.perf_counter()
+        response = await client.post(
+            "/generator/slips",
+            json={"min_amount": 1.0, "max_amount": 100.0, "slips_per_user": slips_per_user},
+            headers=headers,
+        )
+        result.record(time.perf_counter() - request_start, response.status_code)
+        if response.is_success:
+            slips_created += response.json()["slips_created"]
+
+    result.duration = time.perf_counter() - start_time
+    result.extra = {
+        "users_created": users_created,
+        "slips_created": slips_created,
+        "rows_per_second": round((users_created + slips_created) / result.duration, 2) if result.duration else 0.0,
+    }
+    return result
@@ -0,0 +1,129 @@
+# backend/scripts/backfill_slip_users.py
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, NoReturn
+
+from tortoise import Tortoise, connections
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.app.db_config import describe_db_config, get_tortoise_config  # noqa: E402
+
+# Links one id range of slips to the user holding the card number. The statement must start
+# with UPDATE so Tortoise's asyncpg client reports the affected row count.
+BACKFILL_SQL = """UPDATE slips
+SET user_id = owners.user_id
+FROM (
+    SELECT slips.id AS slip_id, MIN(users.id) AS user_id
+    FROM slips
+    JOIN users ON users.card_number = slips.card_number
+    WHERE slips.id > $1 AND slips.id <= $2 AND slips.user_id IS NULL
+    GROUP BY slips.id
+) AS owners
+WHERE slips.id = owners.slip_id
+"""
+
+# Indexes migrations 2 and 4 leave out on populated tables, since a plain CREATE INDEX blocks writes
+BACKFILL_INDEXES = (
+    ("idx_slips_created_at_id", 'CREATE INDEX CONCURRENTLY "idx_slips_created_at_id" ON "slips" ("created_at", "id")'),
+    ("idx_users_card_number", 'CREATE INDEX CONCURRENTLY "idx_users_card_number" ON "users" ("card_number")'),
+    (
+        "idx_slips_user_id_created_at",
+        'CREATE INDEX CONCURRENTLY "idx_slips_user_id_created_at" ON "slips" ("user_id", "created_at")',
+    ),
+)
+
+
+async def build_indexes_concurrently(conn: Any) -> None:
+    """
+    Build the indexes the migrations skip on populated tables, without blocking writes.
+
+    CONCURRENTLY can't run inside a transaction, so each index is its own statement. An
+    interrupted build leaves an invalid index behind; it is dropped and built again. Indexes
+    that already exist, such as the ones created on the partitioned slips table, are kept.
+    """
+    for name, create_sql in BACKFILL_INDEXES:
+        _, rows = await conn.execute_query(
+            "SELECT pg_index.indisvalid AS valid FROM pg_class "
+            "JOIN pg_index ON pg_index.indexrelid = pg_class.oid WHERE pg_class.relname = $1",
+            [name],
+        )
+        if rows and rows[0]["valid"]:
+            continue
+        if rows:
+            await conn.execute_script(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+        start_time = time.perf_counter()
+        await conn.execute_script(create_sql)
+        print(f"Built {name} in {time.perf_counter() - start_time:.1f}s")
+
+
+async def backfill_slip_users(conn: Any, batch_size: int, pause: float) -> int:
+    """
+    Set slips.user_id for existing slips, one short transaction per id range.
+
+    Slips written after the migration already carry user_id, so only ids up to the
+    current maximum are visited. Re-running resumes cheaply: linked rows are skipped.
+
+    Args:
+        conn: Database connection
+        batch_size: Number of slip ids covered by each UPDATE
+        pause: Seconds to sleep between batches, to leave room for regular traffic
+
+    Returns:
+        The number of slips linked to a user
+    """
+    _, rows = await conn.execute_query("SELECT COALESCE(MIN(id), 0) AS low, COALESCE(MAX(id), 0) AS high FROM slips")
+    low, high = rows[0]["low"], rows[0]["high"]
+
+    linked = 0
+    start_time = time.perf_counter()
+    for range_start in range(low - 1, high, batch_size):
+        updated, _ = await conn.execute_query(BACKFILL_SQL, [range_start, range_start + batch_size])
+        linked += updated
+
+        range_end = min(range_start + batch_size, high)
+        ids_per_second = (range_end - low + 1) / max(time.perf_counter() - start_time, 1e-9)
+        print(f"Backfilled ids up to {range_end}: {linked} linked, {ids_per_second:.0f} ids/s")
+        if pause:
+            await asyncio.sleep(pause)
+
+    return linked
+
+
+async def main() -> None:
+    """Build the skipped indexes, backfill slips.user_id in batches, then validate the foreign key"""
+    parser = argparse.ArgumentParser(description="Link existing slips to their users")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Slip ids per UPDATE")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    args = parser.parse_args()
+
+    print(describe_db_config(get_tortoise_config()))
+    try:
+        await Tortoise.init(config=get_tortoise_config())
+        conn = connections.get("default")
+
+        # The backfill joins on users.card_number, so its index has to exist first
+        await build_indexes_concurrently(conn)
+
+        linked = await backfill_slip_users(conn, args.batch_size, args.pause)
+        print(f"Linked {linked} slips to their users")
+
+        # Validation scans slips but only takes a SHARE UPDATE EXCLUSIVE lock, so writes continue
+        await conn.execute_script('ALTER TABLE "slips" VALIDATE CONSTRAINT "fk_slips_users_user_id"')
+        print("Validated fk_slips_users_user_id")
+    finally:
+        await Tortoise.close_connections()
+
+
+def main_wrapper() -> NoReturn:
+    """Wrapper for Poetry scripts"""
+    asyncio.run(main())
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main_wrapper()
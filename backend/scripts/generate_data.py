@@ -0,0 +1,287 @@
+# backend/scripts/generate_data.py
+import argparse
+import asyncio
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Dict, List, NoReturn, Tuple
+
+import asyncpg
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.app.datagen import (  # noqa: E402
+    AMOUNT_DISTRIBUTIONS,
+    MAX_SEED,
+    DataGenerator,
+    slips_per_user_index,
+    split_range,
+)
+from backend.app.db_config import describe_db_config, get_tortoise_config  # noqa: E402
+from backend.app.hashing import get_password_hash  # noqa: E402
+
+USER_COLUMNS = ("id", "username", "password", "role", "is_active", "card_number", "created_at")
+SLIP_COLUMNS = ("user_id", "card_number", "amount", "created_at")
+
+# Secondary indexes on users and slips; unique and constraint indexes stay, so usernames are still checked
+SECONDARY_INDEXES_SQL = """
+SELECT i.relname AS name, pg_get_indexdef(i.oid) AS definition
+FROM pg_index x
+JOIN pg_class i ON i.oid = x.indexrelid
+WHERE x.indrelid IN (to_regclass('users'), to_regclass('slips'))
+  AND NOT x.indisunique
+  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+ORDER BY i.relname
+"""
+
+# Other sessions on the database; dropping indexes under them would slow every read they make
+OTHER_CONNECTIONS_SQL = """
+SELECT count(*) FROM pg_stat_activity
+WHERE datname = current_database() AND pid <> pg_backend_pid() AND backend_type = 'client backend'
+"""
+
+
+class ShardPlan:
+    """The blocks of user indexes one worker process writes, with everything it needs to do so"""
+
+    def __init__(self, args: argparse.Namespace, blocks: Tuple[int, int], id_base: int, password: str) -> None:
+        self.seed = args.seed
+        self.users = args.users
+        self.slips = args.slips
+        self.block_users = args.block_users
+        self.blocks = blocks
+        self.id_base = id_base
+        self.password = password
+        self.distribution = args.distribution
+        self.min_amount = args.min_amount
+        self.max_amount = args.max_amount
+
+
+async def copy_shard(credentials: Dict[str, Any], plan: ShardPlan) -> Dict[str, float]:
+    """Write the users of every block in the shard, then their slips, with COPY over one connection"""
+    generator = DataGenerator(plan.seed)
+    created_at = datetime.now(UTC)
+    users_written = slips_written = 0
+    start_time = time.perf_counter()
+
+    conn = await asyncpg.connect(**credentials)
+    try:
+        for block in range(*plan.blocks):
+            start = block * plan.block_users
+            count = min(plan.block_users, plan.users - start)
+            card_numbers = generator.card_numbers(start, count)
+            user_ids = range(plan.id_base + start, plan.id_base + start + count)
+
+            await conn.copy_records_to_table(
+                "users",
+                columns=USER_COLUMNS,
+                records=[
+                    (user_id, username, plan.password, "customer", True, card_number, created_at)
+                    for user_id, username, card_number in zip(user_ids, generator.usernames(start, count), card_numbers)
+                ],
+            )
+            users_written += count
+
+            slip_users = [
+                (user_id, card_number)
+                for index, user_id, card_number in zip(range(start, start + count), user_ids, card_numbers)
+                for _ in range(slips_per_user_index(index, plan.users, plan.slips))
+            ]
+            if not slip_users:
+                continue
+            # Keyed by block, so amounts don't depend on how blocks were spread over workers
+            amounts = generator.amounts(
+                [card_number for _, card_number in slip_users],
+                plan.min_amount,
+                plan.max_amount,
+                plan.distribution,
+                key=block,
+            )
+            await conn.copy_records_to_table(
+                "slips",
+                columns=SLIP_COLUMNS,
+                records=[
+                    (user_id, card_number, amount, created_at)
+                    for (user_id, card_number), amount in zip(slip_users, amounts)
+                ],
+            )
+            slips_written += len(slip_users)
+    finally:
+        await conn.close()
+
+    return {"users": users_written, "slips": slips_written, "seconds": time.perf_counter() - start_time}
+
+
+def generate_shard(credentials: Dict[str, Any], plan: ShardPlan) -> Dict[str, float]:
+    """Process pool entry point; each worker runs its own event loop and connection"""
+    return asyncio.run(copy_shard(credentials, plan))
+
+
+async def reserve_user_ids(conn: asyncpg.Connection, count: int) -> int:
+    """
+    Advance the users id sequence past count ids and return the first one, so workers can assign ids.
+
+    The block is reserved in one statement while users is locked against inserts, so neither a
+    registration nor another generator can draw an id from the sequence in between.
+    """
+    async with conn.transaction():
+        await conn.execute("LOCK TABLE users IN SHARE ROW EXCLUSIVE MODE")
+        last_id = await conn.fetchval(
+            "SELECT setval(seq, nextval(seq) + $1::bigint - 1) FROM pg_get_serial_sequence('users', 'id') AS seq",
+            count,
+        )
+    return int(last_id) - count + 1
+
+
+async def check_index_rebuild(conn: asyncpg.Connection) -> None:
+    """
+    Refuse to drop indexes unless users and slips are empty and no other client is connected.
+
+    Reads go without their indexes until the rebuild finishes, and a killed run leaves them
+    dropped, so this is only meant for seeding a fresh database.
+    """
+    if await conn.fetchval("SELECT EXISTS (SELECT 1 FROM users) OR EXISTS (SELECT 1 FROM slips)"):
+        raise SystemExit("--rebuild-indexes needs empty users and slips tables")
+    other_connections = await conn.fetchval(OTHER_CONNECTIONS_SQL)
+    if other_connections:
+        raise SystemExit(f"--rebuild-indexes needs an otherwise unused database, {other_connections} clients connected")
+
+
+async def drop_secondary_indexes(conn: asyncpg.Connection) -> List[str]:
+    """Drop the secondary indexes and return the statements that recreate them"""
+    rows = await conn.fetch(SECONDARY_INDEXES_SQL)
+    for row in rows:
+        await conn.execute(f'DROP INDEX IF EXISTS "{row["name"]}"')
+    # Indexes on the partitioned slips table are defined ON ONLY the parent; recreate them on every partition
+    return [row["definition"].replace(" ON ONLY ", " ON ") for row in rows]
+
+
+async def build_indexes(credentials: Dict[str, Any], definitions: List[str], workers: int) -> None:
+    """Build the indexes in parallel, each on its own connection"""
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for definition in definitions:
+        queue.put_nowait(definition)
+
+    async def builder() -> None:
+        conn = await asyncpg.connect(**credentials)
+        try:
+            while not queue.empty():
+                definition = queue.get_nowait()
+                await conn.execute(definition)
+                print(f"Built {definition}")
+        finally:
+            await conn.close()
+
+    await asyncio.gather(*(builder() for _ in range(min(workers, len(definitions)))))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed users and slips with COPY from a pool of worker processes")
+    parser.add_argument("--users", type=int, default=100000, help="Number of customers to create")
+    parser.add_argument("--slips", type=int, default=1000000, help="Number of slips, spread evenly over the users")
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible dataset (default: random)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Slips per COPY")
+    parser.add_argument("--distribution", choices=AMOUNT_DISTRIBUTIONS, default="uniform", help="Amount distribution")
+    parser.add_argument("--min-amount", type=float, default=10.0)
+    parser.add_argument("--max-amount", type=float, default=5000.0)
+    parser.add_argument("--password", default="password123", help="Password shared by every generated user")
+    parser.add_argument(
+        "--rebuild-indexes",
+        action="store_true",
+        help="Drop the secondary indexes for the load and rebuild them after; only on an empty, unused database",
+    )
+    args = parser.parse_args()
+
+    if args.users <= 0 or args.slips < 0:
+        parser.error("--users must be positive and --slips can't be negative")
+    if args.seed is not None and not 0 <= args.seed <= MAX_SEED:
+        parser.error(f"--seed must be between 0 and {MAX_SEED}")
+    if not 0.01 <= args.min_amount < args.max_amount:
+        parser.error("--min-amount must be at least 0.01 and below --max-amount")
+    # Users are written in blocks holding about one COPY of slips each
+    args.block_users = max(1, args.chunk_size // max(1, math.ceil(args.slips / args.users)))
+    return args
+
+
+async def main() -> None:
+    """Generate the dataset, rebuild the indexes if asked to and refresh planner statistics"""
+    args = parse_args()
+    config = get_tortoise_config()
+    print(describe_db_config(config))
+    connection = config["connections"]["default"]
+    if connection["engine"] != "tortoise.backends.asyncpg":
+        raise SystemExit("generate-data writes with COPY and needs a PostgreSQL database")
+    credentials = {key: connection["credentials"][key] for key in ("host", "port", "user", "password", "database")}
+
+    generator = DataGenerator(args.seed)
+    args.seed = generator.seed
+    timings: Dict[str, float] = {}
+    start_time = time.perf_counter()
+
+    conn = await asyncpg.connect(**credentials)
+    try:
+        if await conn.fetchval("SELECT EXISTS (SELECT 1 FROM users WHERE username = $1)", generator.usernames(0, 1)[0]):
+            raise SystemExit(f"Users for seed {generator.seed} already exist")
+        if args.rebuild_indexes:
+            await check_index_rebuild(conn)
+
+        phase_start = time.perf_counter()
+        id_base = await reserve_user_ids(conn, args.users)
+        password = get_password_hash(args.password)
+        definitions = await drop_secondary_indexes(conn) if args.rebuild_indexes else []
+        timings["prepare"] = time.perf_counter() - phase_start
+
+        block_count = math.ceil(args.users / args.block_users)
+        shards = split_range(0, block_count, args.workers)
+        print(
+            f"Writing {args.users} users and {args.slips} slips with seed {generator.seed} "
+            f"from {len(shards)} workers in blocks of {args.block_users} users"
+        )
+
+        phase_start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+                results = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            pool, generate_shard, credentials, ShardPlan(args, shard, id_base, password)
+                        )
+                        for shard in shards
+                    )
+                )
+            timings["copy"] = time.perf_counter() - phase_start
+        finally:
+            # Rebuild even after a failed load, so the tables are never left without their indexes
+            phase_start = time.perf_counter()
+            await build_indexes(credentials, definitions, args.workers)
+            timings["indexes"] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        await conn.execute("ANALYZE users, slips, slip_stats_hourly")
+        timings["analyze"] = time.perf_counter() - phase_start
+    finally:
+        await conn.close()
+
+    timings["total"] = time.perf_counter() - start_time
+    users_written = sum(int(result["users"]) for result in results)
+    slips_written = sum(int(result["slips"]) for result in results)
+    print(f"Wrote {users_written} users and {slips_written} slips with seed {generator.seed}")
+    print(f"Load rate: {(users_written + slips_written) / max(timings['copy'], 1e-9):.0f} rows/s")
+    print("Timings: " + ", ".join(f"{phase}={seconds:.2f}s" for phase, seconds in timings.items()))
+
+
+def main_wrapper() -> NoReturn:
+    """Wrapper for Poetry scripts"""
+    asyncio.run(main())
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main_wrapper()
@@ -0,0 +1,68 @@
+# backend/scripts/manage_partitions.py
+import argparse
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+from typing import NoReturn
+
+from tortoise import Tortoise, connections
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.app.db_config import describe_db_config, get_tortoise_config  # noqa: E402
+from backend.app.partitions import (  # noqa: E402
+    SLIP_PARTITION_MONTHS_AHEAD,
+    add_months,
+    drop_slip_partitions_before,
+    ensure_slip_partitions,
+    is_partitioned,
+)
+
+
+async def main() -> None:
+    """Create upcoming slips partitions and optionally drop the ones past retention"""
+    parser = argparse.ArgumentParser(description="Manage monthly slips partitions")
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=SLIP_PARTITION_MONTHS_AHEAD,
+        help="Number of future months to create partitions for",
+    )
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=None,
+        help="Drop partitions whose month ended more than this many months ago",
+    )
+    args = parser.parse_args()
+
+    print(describe_db_config(get_tortoise_config()))
+    try:
+        await Tortoise.init(config=get_tortoise_config())
+        conn = connections.get("default")
+
+        if not await is_partitioned(conn):
+            print("The slips table is not partitioned, nothing to do.")
+            return
+
+        created = await ensure_slip_partitions(conn, args.months_ahead)
+        print(f"Created partitions: {', '.join(created) or 'none'}")
+
+        if args.retention_months is not None:
+            cutoff = add_months(date.today().replace(day=1), -args.retention_months)
+            dropped = await drop_slip_partitions_before(conn, cutoff)
+            print(f"Dropped partitions before {cutoff}: {', '.join(dropped) or 'none'}")
+    finally:
+        await Tortoise.close_connections()
+
+
+def main_wrapper() -> NoReturn:
+    """Wrapper for Poetry scripts"""
+    asyncio.run(main())
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main_wrapper()
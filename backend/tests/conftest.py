@@ -5,7 +5,21 @@ from fastapi import FastAPI
 from starlette.testclient import TestClient
 from tortoise.contrib.fastapi import register_tortoise
 
-from backend.app.main import login_for_access_token, register
+from backend.app.main import (
+    User,
+    bulk_create_slips,
+    cleanup_test_data,
+    export_generated_data,
+    generate_slips,
+    generate_users,
+    get_admin_user,
+    get_generator_stats,
+    get_slip_stats,
+    list_slips,
+    login_for_access_token,
+    register,
+    rotate_users,
+)
 
 
 @pytest.fixture(scope="module")
@@ -16,6 +30,18 @@ def test_app() -> FastAPI:
     # Import your routes and models to the test app
     app_for_testing.post("/token")(login_for_access_token)
     app_for_testing.post("/register")(register)
+    app_for_testing.post("/generator/users")(generate_users)
+    app_for_testing.post("/generator/slips")(generate_slips)
+    app_for_testing.get("/generator/stats")(get_generator_stats)
+    app_for_testing.post("/generator/rotate")(rotate_users)
+    app_for_testing.post("/generator/cleanup")(cleanup_test_data)
+    app_for_testing.get("/generator/export/{table}")(export_generated_data)
+    app_for_testing.get("/slips/stats")(get_slip_stats)
+    app_for_testing.post("/slips/bulk")(bulk_create_slips)
+    app_for_testing.get("/slips")(list_slips)
+
+    # Admin-only routes are exercised without going through token authentication
+    app_for_testing.dependency_overrides[get_admin_user] = lambda: User(username="test_admin", role="admin")
 
     # Set up the test app with test configuration
     register_tortoise(
@@ -0,0 +1,50 @@
+import httpx
+import pytest
+
+from backend.benchmarks.auth import add_ratios, compare
+from backend.benchmarks.harness import percentile, run_load
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    """Test that percentiles pick an observed value by nearest rank."""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile(values, 1.0) == 100.0
+    assert percentile([], 0.5) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_run_load_counts_requests_and_errors() -> None:
+    """Test that exactly the requested number of calls is made across workers."""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(500 if calls % 5 == 0 else 200)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test") as client:
+        result = await run_load("ping", client, lambda client: client.get("/ping"), concurrency=3, requests=20)
+
+    report = result.to_dict()
+    assert calls == 20
+    assert report["requests"] == 20
+    assert report["errors"] == 4
+    assert report["status_codes"] == {"200": 16, "500": 4}
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+
+
+def test_compare_flags_cases_beyond_tolerance() -> None:
+    """Test that only ratios above baseline * (1 + tolerance) are reported, whatever the machine speed."""
+    baseline = {
+        "tolerance": 0.5,
+        "cases": {"calibration": {"ratio": 1.0}, "fast": {"ratio": 1.0}, "slow": {"ratio": 1.0}},
+    }
+    # Twice as slow a machine: absolute medians doubled, but only "slow" grew relative to calibration
+    results = {"calibration": {"median_ms": 2.0}, "fast": {"median_ms": 2.8}, "slow": {"median_ms": 3.2}}
+    add_ratios(results)
+
+    regressions = compare(results, baseline)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow:")
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from backend.app.cache import SingleFlight, TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hits_misses_and_expiry() -> None:
+    """Test that entries are served until their TTL runs out."""
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=5, clock=clock)
+
+    assert cache.get("alice") is None
+    cache.set("alice", 1)
+    assert cache.get("alice") == 1
+
+    clock.now = 6
+    assert cache.get("alice") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """Test that the least recently used entry is evicted when the cache is full."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+
+    cache.set("alice", 1)
+    cache.set("bob", 2)
+    cache.get("alice")
+    cache.set("carol", 3)
+
+    assert cache.get("bob") is None
+    assert cache.get("alice") == 1
+    assert cache.get("carol") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_invalidate() -> None:
+    """Test that invalidated entries are no longer served."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+
+    cache.set("alice", 1)
+    cache.invalidate("alice")
+
+    assert cache.get("alice") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_collapses_concurrent_calls() -> None:
+    """Test that concurrent callers share one in-flight call."""
+    flight: SingleFlight[str, int] = SingleFlight()
+    calls = 0
+
+    async def count() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(flight.run("counts", count) for _ in range(5)))
+    assert results == [42] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+    # Once finished, the next call runs again
+    assert await flight.run("counts", count) == 42
+    assert calls == 2
@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+from typing import Any, List, Optional
+
+import pytest
+from starlette.testclient import TestClient
+from tortoise import connections
+
+from backend.app import config
+
+
+@pytest.fixture
+def startup(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> List[str]:
+    """Run init_db against the test database, which aerich hasn't migrated"""
+    calls: List[str] = []
+
+    async def noop(*args: Any, **kwargs: Any) -> None:
+        return None
+
+    async def applied_version(conn: Any) -> Optional[str]:
+        return None
+
+    async def generate_schemas(*args: Any, **kwargs: Any) -> None:
+        calls.append("generate_schemas")
+
+    monkeypatch.setattr(config.Tortoise, "init", noop)
+    monkeypatch.setattr(config.Tortoise, "generate_schemas", generate_schemas)
+    monkeypatch.setattr(config, "get_applied_migration_version", applied_version)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_init_db_refuses_schema_behind_migrations(monkeypatch: pytest.MonkeyPatch, startup: List[str]) -> None:
+    """Test that startup stops, without generating tables, when the schema is behind the migrations."""
+
+    async def applied_version(conn: Any) -> Optional[str]:
+        return "4_20250420000000_add_slips_user_id.py"
+
+    monkeypatch.setattr(config, "get_applied_migration_version", applied_version)
+
+    with pytest.raises(RuntimeError, match="aerich upgrade"):
+        await config.init_db()
+
+    assert startup == []
+
+
+@pytest.mark.asyncio
+async def test_init_db_keeps_existing_unmigrated_schema(startup: List[str]) -> None:
+    """Test that a non-PostgreSQL schema without aerich versions is used as is."""
+    await config.init_db()
+
+    assert startup == []
+
+
+@pytest.mark.asyncio
+async def test_init_db_generates_tables_on_empty_database(monkeypatch: pytest.MonkeyPatch, startup: List[str]) -> None:
+    """Test that an empty database gets its tables generated."""
+
+    async def no_schema(conn: Any) -> bool:
+        return False
+
+    monkeypatch.setattr(config, "schema_exists", no_schema)
+
+    await config.init_db()
+
+    assert startup == ["generate_schemas"]
+
+
+@pytest.mark.asyncio
+async def test_init_db_refuses_empty_postgres_database(monkeypatch: pytest.MonkeyPatch, startup: List[str]) -> None:
+    """Test that an empty PostgreSQL database is left to the migrations instead of generated tables."""
+
+    async def no_schema(conn: Any) -> bool:
+        return False
+
+    monkeypatch.setattr(config, "schema_exists", no_schema)
+    monkeypatch.setattr(connections.get("default"), "capabilities", SimpleNamespace(dialect="postgres"))
+
+    with pytest.raises(RuntimeError, match="aerich upgrade"):
+        await config.init_db()
+
+    assert startup == []
+
+
+@pytest.mark.asyncio
+async def test_init_db_survives_partition_errors(monkeypatch: pytest.MonkeyPatch, startup: List[str]) -> None:
+    """Test that a failing partition maintenance run doesn't abort startup."""
+
+    async def fail(conn: Any) -> List[str]:
+        raise RuntimeError("updated partition constraint for default partition would be violated")
+
+    monkeypatch.setattr(config, "ensure_slip_partitions", fail)
+
+    timings = await config.init_db()
+
+    assert "partitions" in timings
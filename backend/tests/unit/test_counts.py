@@ -0,0 +1,31 @@
+from backend.app.counts import combine_estimates
+
+
+def test_combine_estimates_prefers_analyzed_partitioned_parent() -> None:
+    """Test that an analyzed partitioned parent is not added to its partitions."""
+    rows = [
+        {"relkind": "p", "reltuples": 300.0, "is_parent": True},
+        {"relkind": "r", "reltuples": 100.0, "is_parent": False},
+        {"relkind": "r", "reltuples": 200.0, "is_parent": False},
+    ]
+    assert combine_estimates(rows) == 300
+
+
+def test_combine_estimates_sums_leaves_of_unanalyzed_parent() -> None:
+    """Test that leaf estimates are summed while the parent has none, skipping unanalyzed leaves."""
+    rows = [
+        {"relkind": "p", "reltuples": -1.0, "is_parent": True},
+        {"relkind": "r", "reltuples": 100.0, "is_parent": False},
+        {"relkind": "r", "reltuples": -1.0, "is_parent": False},
+    ]
+    assert combine_estimates(rows) == 100
+
+    rows[1]["reltuples"] = -1.0
+    assert combine_estimates(rows) is None
+
+
+def test_combine_estimates_plain_table() -> None:
+    """Test that a plain table uses its own estimate, and none before it is analyzed."""
+    assert combine_estimates([{"relkind": "r", "reltuples": 42.0, "is_parent": True}]) == 42
+    assert combine_estimates([{"relkind": "r", "reltuples": -1.0, "is_parent": True}]) is None
+    assert combine_estimates([]) is None
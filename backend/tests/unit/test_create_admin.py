@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+import pytest
+from starlette.testclient import TestClient
+
+from backend.app.hashing import verify_password
+from backend.app.main import User
+from backend.scripts.create_admin import load_users, provision_users
+from backend.tests.unit.helpers import get_unique_username
+
+
+def test_load_users_from_csv_and_json(tmp_path: Path) -> None:
+    """Test that users are read from CSV and JSON files, with admin as the default role."""
+    csv_file = tmp_path / "users.csv"
+    csv_file.write_text("username,password,role\nops_one,secret1,\nops_two,secret2,customer\n")
+    json_file = tmp_path / "users.json"
+    json_file.write_text(json.dumps([{"username": "ops_three", "password": "secret3"}]))
+
+    assert load_users(csv_file) == [("ops_one", "secret1", "admin"), ("ops_two", "secret2", "customer")]
+    assert load_users(json_file) == [("ops_three", "secret3", "admin")]
+
+    json_file.write_text(json.dumps([{"username": "ops_four", "password": "secret4", "role": "root"}]))
+    with pytest.raises(ValueError):
+        load_users(json_file)
+
+
+@pytest.mark.asyncio
+async def test_provision_users_creates_and_promotes(client: TestClient) -> None:
+    """Test that one run creates new users, promotes listed customers and never demotes admins."""
+    new_admin = get_unique_username("new_admin")
+    customer = await User.create(username=get_unique_username("promoted"), password="old-hash", role="customer")
+    admin = await User.create(username=get_unique_username("kept_admin"), password="old-hash", role="admin")
+
+    result = await provision_users(
+        [
+            (new_admin, "new-password", "admin"),
+            (customer.username, "ignored", "admin"),
+            (admin.username, "ignored", "customer"),
+            (new_admin, "duplicate-ignored", "customer"),
+        ],
+        workers=1,
+    )
+
+    assert (result["processed"], result["created"], result["promoted"], result["unchanged"]) == (3, 1, 1, 1)
+    created = await User.get(username=new_admin)
+    assert created.role == "admin" and created.is_active
+    assert verify_password("new-password", created.password)
+
+    await customer.refresh_from_db()
+    await admin.refresh_from_db()
+    assert customer.role == "admin" and customer.password == "old-hash"
+    assert admin.role == "admin"
+
+    # Clean up
+    await User.filter(username__in=[new_admin, customer.username, admin.username]).delete()
@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+import pytest
+
+from backend.app.datagen import (
+    MAX_SEED,
+    DataGenerator,
+    is_luhn_valid,
+    luhn_check_digit,
+    slips_per_user_index,
+    split_range,
+)
+
+
+def test_luhn_check_digit() -> None:
+    """Test the check digit against a known valid card number."""
+    assert luhn_check_digit("411111111111111") == 1
+    assert is_luhn_valid("4111111111111111")
+    assert not is_luhn_valid("4111111111111112")
+
+
+def test_generator_is_reproducible_across_batches() -> None:
+    """Test that the same seed yields the same users however the index range is split."""
+    whole = DataGenerator(seed=42)
+    split = DataGenerator(seed=42)
+
+    cards = whole.card_numbers(0, 1000)
+    assert split.card_numbers(0, 400) + split.card_numbers(400, 600) == cards
+    assert whole.usernames(998, 2) == ["test_user_42_998", "test_user_42_999"]
+
+    assert len(set(cards)) == len(cards)
+    assert all(len(card) == 16 and is_luhn_valid(card) for card in cards)
+    assert DataGenerator(seed=43).card_numbers(0, 1000) != cards
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "lognormal", "zipf"])
+def test_amounts_are_seeded_and_bounded(distribution: str) -> None:
+    """Test that amounts repeat for the same seed and key and stay within the bounds."""
+    generator = DataGenerator(seed=7)
+    cards = generator.card_numbers(0, 50) * 20
+
+    amounts = generator.amounts(cards, 1.0, 500.0, distribution, key=1)
+
+    assert amounts == DataGenerator(seed=7).amounts(cards, 1.0, 500.0, distribution, key=1)
+    assert amounts != generator.amounts(cards, 1.0, 500.0, distribution, key=2)
+    assert all(Decimal("1.00") <= amount <= Decimal("500.00") for amount in amounts)
+    assert all(amount.as_tuple().exponent == -2 for amount in amounts)
+
+
+def test_zipf_amounts_are_skewed_by_card() -> None:
+    """Test that under zipf a few cards carry a large share of the volume."""
+    generator = DataGenerator(seed=7)
+    cards = generator.card_numbers(0, 200)
+    amounts = generator.amounts(cards * 10, 1.0, 1000.0, "zipf")
+
+    totals = sorted((sum(amounts[index::200], Decimal(0)) for index in range(200)), reverse=True)
+    # Under uniform amounts the top tenth of the cards would hold about an eighth of the volume
+    assert sum(totals[:20]) > sum(totals) / 4
+
+
+def test_lognormal_amounts_clamp_to_a_cent() -> None:
+    """Test that a minimum below a cent is raised to one cent instead of failing."""
+    amounts = DataGenerator(seed=3).amounts(["4111111111111111"] * 50, 0.001, 5.0, "lognormal")
+
+    assert all(Decimal("0.01") <= amount <= Decimal("5.00") for amount in amounts)
+
+
+def test_amounts_reject_unknown_distribution() -> None:
+    """Test that an unsupported distribution fails fast."""
+    with pytest.raises(ValueError):
+        DataGenerator(seed=1).amounts(["4111111111111111"], 1.0, 2.0, "normal")
+
+
+def test_seed_is_bounded() -> None:
+    """Test that the largest seed still fits the username column and larger ones are rejected."""
+    assert len(DataGenerator(seed=MAX_SEED).usernames(10**9, 1)[0]) <= 50
+    with pytest.raises(ValueError):
+        DataGenerator(seed=MAX_SEED + 1)
+
+
+def test_split_range_and_slip_spread() -> None:
+    """Test that shards cover the range exactly once and slips are spread over every user."""
+    assert split_range(0, 10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert split_range(0, 2, 8) == [(0, 1), (1, 2)]
+
+    assert [slips_per_user_index(index, 4, 10) for index in range(4)] == [3, 3, 2, 2]
+    assert sum(slips_per_user_index(index, 7, 100) for index in range(7)) == 100
@@ -0,0 +1,243 @@
+import csv
+import gzip
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from starlette.testclient import TestClient
+
+from backend.app.datagen import DataGenerator, is_luhn_valid
+from backend.app.main import Slip, User, generator_counts
+from backend.tests.unit.helpers import get_unique_username
+
+
+@pytest.mark.asyncio
+async def test_generate_users_in_batches(client: TestClient) -> None:
+    """Test that users are generated across several batches with a shared password hash."""
+    resp = client.post("/generator/users", json={"user_count": 25, "batch_size": 10})
+
+    assert resp.status_code == 200
+    assert resp.json()["users_created"] == 25
+    assert len(resp.json()["users"]) == 25
+
+    usernames = [user["username"] for user in resp.json()["users"]]
+    users = await User.filter(username__in=usernames)
+    assert len(users) == 25
+    assert len({user.password for user in users}) == 1
+    assert all(len(user.card_number) == 16 for user in users)
+
+    # Clean up
+    await User.filter(username__in=usernames).delete()
+
+
+@pytest.mark.asyncio
+async def test_generate_users_rejects_invalid_batch_size(client: TestClient) -> None:
+    """Test that a non-positive batch size is rejected."""
+    resp = client.post("/generator/users", json={"user_count": 5, "batch_size": 0})
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "batch_size must be greater than 0"
+
+
+@pytest.mark.asyncio
+async def test_generate_slips_rejects_sub_cent_min_amount(client: TestClient) -> None:
+    """Test that a minimum amount that rounds to zero cents is rejected."""
+    resp = client.post("/generator/slips", json={"min_amount": 0.001, "max_amount": 20.0, "distribution": "lognormal"})
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "min_amount must be at least 0.01"
+
+
+@pytest.mark.asyncio
+async def test_generate_slips_for_users_in_chunks(client: TestClient) -> None:
+    """Test that slips are generated for every user with a card number."""
+    users = [
+        await User.create(username=get_unique_username("slip_user"), password="x", card_number=f"{i:016d}")
+        for i in range(3)
+    ]
+    card_numbers = [user.card_number for user in users]
+
+    resp = client.post(
+        "/generator/slips",
+        json={"min_amount": 10.0, "max_amount": 20.0, "slips_per_user": 2},
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["slips_created"] >= 6
+    assert "slips_per_second" in resp.json()
+
+    slips = await Slip.filter(card_number__in=card_numbers)
+    assert len(slips) == 6
+    assert all(Decimal("10.00") <= slip.amount <= Decimal("20.00") for slip in slips)
+    assert {slip.user_id for slip in slips} == {user.id for user in users}
+
+    # Clean up
+    await Slip.filter(card_number__in=card_numbers).delete()
+    await User.filter(id__in=[user.id for user in users]).delete()
+
+
+@pytest.mark.asyncio
+async def test_generator_stats_falls_back_to_cached_exact_counts(client: TestClient) -> None:
+    """Test that stats are exact without planner estimates and served from cache until refreshed."""
+    generator_counts.clear()
+    user_count = await User.all().count()
+
+    resp = client.get("/generator/stats")
+    assert resp.status_code == 200
+    assert resp.json() == {"user_count": user_count, "slip_count": await Slip.all().count(), "exact": True}
+
+    user = await User.create(username=get_unique_username(), password="hashed", role="customer")
+    assert client.get("/generator/stats", params={"exact": True}).json()["user_count"] == user_count
+
+    generator_counts.clear()
+    assert client.get("/generator/stats", params={"exact": True}).json()["user_count"] == user_count + 1
+
+    # Clean up
+    await user.delete()
+    generator_counts.clear()
+
+
+@pytest.mark.asyncio
+async def test_rotate_users_shifts_card_numbers(client: TestClient) -> None:
+    """Test that rotation moves every card to another active customer without losing any."""
+    users = [
+        await User.create(
+            username=get_unique_username(), password="hashed", role="customer", card_number=f"{5000 + i:016d}"
+        )
+        for i in range(6)
+    ]
+    ring = User.filter(role="customer", is_active=True, card_number__not_isnull=True)
+    cards_before = sorted(await ring.values_list("card_number", flat=True))
+
+    resp = client.post("/generator/rotate", params={"step": 1})
+    assert resp.status_code == 200
+    assert resp.json()["rotated_users"] == len(cards_before)
+
+    assert sorted(await ring.values_list("card_number", flat=True)) == cards_before
+    for user in users:
+        await user.refresh_from_db()
+    assert all(user.card_number != f"{5000 + i:016d}" for i, user in enumerate(users))
+
+    # Clean up
+    await User.filter(id__in=[user.id for user in users]).delete()
+
+
+def test_rotate_users_rejects_unbindable_step(client: TestClient) -> None:
+    """Test that a step beyond what the rotation statement can bind is rejected before touching users."""
+    resp = client.post("/generator/rotate", params={"step": 2**31})
+
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_cleanup_dry_run_then_batched(client: TestClient) -> None:
+    """Test that a dry run removes nothing and batched cleanup keeps admins."""
+    admin = await User.create(username=get_unique_username(), password="hashed", role="admin")
+    for i in range(5):
+        user = await User.create(username=get_unique_username(), password="hashed", card_number=f"{7000 + i:016d}")
+        await Slip.create(card_number=user.card_number, amount=Decimal("1.00"))
+
+    customers = await User.filter(role="customer").count()
+    slips = await Slip.all().count()
+
+    resp = client.post("/generator/cleanup", params={"mode": "dry_run"})
+    assert resp.status_code == 200
+    assert resp.json() == {"mode": "dry_run", "users_to_remove": customers, "slips_to_remove": slips, "exact": True}
+    assert await Slip.all().count() == slips
+
+    resp = client.post("/generator/cleanup", params={"batch_size": 2})
+    assert resp.status_code == 200
+    assert resp.json() == {"mode": "batched", "users_removed": customers, "slips_removed": slips}
+
+    assert await User.filter(role="customer").count() == 0
+    assert await Slip.all().count() == 0
+    assert await User.filter(id=admin.id).exists()
+
+    # Clean up
+    await admin.delete()
+
+
+@pytest.mark.asyncio
+async def test_generate_users_without_user_list(client: TestClient) -> None:
+    """Test that the created users can be left out of the response."""
+    resp = client.post("/generator/users", json={"user_count": 3, "include_users": False})
+
+    assert resp.status_code == 200
+    assert resp.json()["users_created"] == 3
+    assert "users" not in resp.json()
+
+    # Clean up
+    await User.filter(username__startswith="test_user_").delete()
+
+
+@pytest.mark.asyncio
+async def test_export_users_and_slips(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that exports stream every row across fetches, as gzipped CSV or plain NDJSON."""
+    monkeypatch.setattr("backend.app.export.EXPORT_FETCH_SIZE", 2)
+    users = [
+        await User.create(username=get_unique_username("export_user"), password="secret-hash", card_number=f"{i:016d}")
+        for i in range(5)
+    ]
+    slips = [await Slip.create(user=user, card_number=user.card_number, amount=Decimal("12.50")) for user in users]
+
+    resp = client.get("/generator/export/users")
+    assert resp.status_code == 200
+    assert resp.headers["content-disposition"] == 'attachment; filename="users.csv.gz"'
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(resp.content).decode())))
+    exported = {row["username"]: row for row in rows}
+    assert all(user.username in exported for user in users)
+    assert exported[users[0].username]["card_number"] == users[0].card_number
+    assert "password" not in rows[0]
+
+    resp = client.get("/generator/export/slips", params={"format": "ndjson", "gzip": False})
+    assert resp.status_code == 200
+    exported_slips = [json.loads(line) for line in resp.text.splitlines()]
+    assert {slip.id for slip in slips} <= {slip["id"] for slip in exported_slips}
+    assert Decimal(exported_slips[-1]["amount"]) == Decimal("12.50")
+
+    resp = client.get("/generator/export/passwords")
+    assert resp.status_code == 404
+
+    # Clean up
+    await Slip.filter(id__in=[slip.id for slip in slips]).delete()
+    await User.filter(id__in=[user.id for user in users]).delete()
+
+
+@pytest.mark.asyncio
+async def test_generate_users_with_seed_is_reproducible(client: TestClient) -> None:
+    """Test that a seed yields known Luhn-valid cards and that reusing it is rejected up front."""
+    resp = client.post("/generator/users", json={"user_count": 5, "batch_size": 2, "seed": 1234})
+
+    assert resp.status_code == 200
+    assert resp.json()["seed"] == 1234
+    cards = [user["card_number"] for user in resp.json()["users"]]
+    assert cards == DataGenerator(seed=1234).card_numbers(0, 5)
+    assert all(is_luhn_valid(card) for card in cards)
+
+    resp = client.post("/generator/users", json={"user_count": 5, "seed": 1234})
+    assert resp.status_code == 409
+
+    resp = client.post(
+        "/generator/slips", json={"min_amount": 1.0, "max_amount": 100.0, "distribution": "zipf", "seed": 99}
+    )
+    assert resp.status_code == 200
+    first_run = await Slip.filter(card_number__in=cards).order_by("card_number").values_list("amount", flat=True)
+    await Slip.all().delete()
+
+    resp = client.post(
+        "/generator/slips", json={"min_amount": 1.0, "max_amount": 100.0, "distribution": "zipf", "seed": 99}
+    )
+    second_run = await Slip.filter(card_number__in=cards).order_by("card_number").values_list("amount", flat=True)
+    assert first_run == second_run
+
+    resp = client.post("/generator/slips", json={"distribution": "normal"})
+    assert resp.status_code == 400
+
+    for path in ("/generator/users", "/generator/slips"):
+        resp = client.post(path, json={"seed": 2**127})
+        assert resp.status_code == 422
+
+    # Clean up
+    await Slip.all().delete()
+    await User.filter(username__startswith="test_user_1234_").delete()
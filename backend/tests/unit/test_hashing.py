@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from backend.app.hashing import (
+    HashingExecutor,
+    HashingSaturatedError,
+    build_password_context,
+    get_password_hash,
+    verify_password,
+)
+
+
+@pytest.mark.asyncio
+async def test_hashing_executor_round_trip() -> None:
+    """Test hashing and verifying a password through the executor."""
+    executor = HashingExecutor(workers=2, max_pending=4)
+
+    hashed_password = await executor.run(get_password_hash, "secret")
+
+    assert await executor.run(verify_password, "secret", hashed_password)
+    assert not await executor.run(verify_password, "wrong", hashed_password)
+    assert executor.stats()["completed"] == 3
+    assert executor.stats()["pending"] == 0
+
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hashing_executor_rejects_when_saturated() -> None:
+    """Test that calls beyond the queue limit are rejected instead of queued."""
+    executor = HashingExecutor(workers=1, max_pending=1)
+
+    first = asyncio.ensure_future(executor.run(get_password_hash, "secret"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HashingSaturatedError):
+        await executor.run(get_password_hash, "secret")
+
+    await first
+    assert executor.stats()["rejected"] == 1
+
+    executor.shutdown()
+
+
+def test_password_context_flags_outdated_cost() -> None:
+    """Test that hashes with a different bcrypt cost verify and are rehashed with the configured cost."""
+    outdated = build_password_context(bcrypt_rounds=5).hash("secret")
+
+    verified, new_hash = build_password_context(bcrypt_rounds=4).verify_and_update("secret", outdated)
+
+    assert verified
+    assert new_hash is not None and new_hash.startswith("$2b$04$")
+    assert build_password_context(bcrypt_rounds=4).verify_and_update("wrong", outdated) == (False, None)
+
+
+def test_password_context_rejects_unknown_scheme() -> None:
+    """Test that an unsupported PASSWORD_SCHEME fails fast."""
+    with pytest.raises(ValueError):
+        build_password_context(scheme="md5_crypt")
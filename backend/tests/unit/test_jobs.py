@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any, Dict
+
+import pytest
+from fastapi import Response
+
+from backend.app import main
+from backend.app.jobs import Job, JobManager, JobStatus
+
+
+@pytest.mark.asyncio
+async def test_job_reports_progress_and_result() -> None:
+    """Test that a finished job exposes its progress and result."""
+    manager = JobManager(max_concurrent=1)
+
+    async def workload(job: Job) -> Dict[str, Any]:
+        job.set_total(10)
+        job.advance(10)
+        return {"rows": 10}
+
+    job = manager.submit("users", workload)
+    await asyncio.sleep(0.01)
+
+    report = manager.get(job.id).to_dict()  # type: ignore
+    assert report["status"] == JobStatus.SUCCEEDED.value
+    assert report["progress"] == 1.0
+    assert report["result"] == {"rows": 10}
+
+
+@pytest.mark.asyncio
+async def test_jobs_respect_concurrency_limit_and_cancel() -> None:
+    """Test that a second job waits for the first and that jobs can be cancelled."""
+    manager = JobManager(max_concurrent=1)
+    release = asyncio.Event()
+
+    async def blocking_workload(job: Job) -> Dict[str, Any]:
+        await release.wait()
+        return {}
+
+    first = manager.submit("slips", blocking_workload)
+    second = manager.submit("slips", blocking_workload)
+    await asyncio.sleep(0.01)
+
+    assert first.status == JobStatus.RUNNING
+    assert second.status == JobStatus.PENDING
+
+    assert manager.cancel(first.id)
+    await asyncio.sleep(0.01)
+    assert first.status == JobStatus.CANCELLED
+    assert second.status == JobStatus.RUNNING
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert second.status == JobStatus.SUCCEEDED
+    assert not manager.cancel(second.id)
+
+
+@pytest.mark.asyncio
+async def test_inline_runs_share_the_concurrency_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that concurrent inline generator runs are serialized and errors reach the caller."""
+    manager = JobManager(max_concurrent=1)
+    monkeypatch.setattr(main, "job_manager", manager)
+    running = 0
+    peak = 0
+
+    async def workload(job: Job) -> Dict[str, Any]:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"kind": job.kind}
+
+    results = await asyncio.gather(
+        main.run_generator("users", workload, False, Response()),
+        main.run_generator("slips", workload, False, Response()),
+    )
+
+    assert results == [{"kind": "users"}, {"kind": "slips"}]
+    assert peak == 1
+
+    async def failing_workload(job: Job) -> Dict[str, Any]:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await main.run_generator("users", failing_workload, False, Response())
@@ -0,0 +1,32 @@
+from backend.app.metrics import Histogram, MetricsWriter
+
+
+def test_histogram_buckets_and_quantile() -> None:
+    """Test that observations land in the right buckets."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative_counts() == [2, 3, 4]
+    assert histogram.count == 4
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.99) == float("inf")
+
+
+def test_metrics_writer_renders_exposition_format() -> None:
+    """Test the Prometheus text exposition output."""
+    histogram = Histogram(buckets=(0.1,))
+    histogram.observe(0.05)
+
+    writer = MetricsWriter()
+    writer.counter("calls_total", "Calls", 3, {"outcome": "ok"})
+    writer.counter("calls_total", "Calls", 1, {"outcome": "failed"})
+    writer.histogram("latency_seconds", "Latency", histogram, {"route": "/token"})
+    output = writer.render()
+
+    assert output.count("# TYPE calls_total counter") == 1
+    assert 'calls_total{outcome="ok"} 3' in output
+    assert 'latency_seconds_bucket{route="/token",le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{route="/token",le="+Inf"} 1' in output
+    assert 'latency_seconds_count{route="/token"} 1' in output
@@ -0,0 +1,37 @@
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from backend.app.metrics import RequestMetrics
+from backend.app.middleware import TimingMiddleware, request_logger, start_request_logging, stop_request_logging
+
+
+def test_timing_middleware_records_route_latency() -> None:
+    """Test that the timing header is added and latency is recorded per route template."""
+    metrics = RequestMetrics()
+    app = FastAPI()
+    app.add_middleware(TimingMiddleware, metrics=metrics, log_sample_rate=0.0)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int) -> dict:
+        return {"item_id": item_id}
+
+    with TestClient(app) as client:
+        first = client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+    assert first.status_code == 200
+    assert first.headers["X-Process-Time"].endswith("ms")
+    assert metrics.histograms[("GET", "/items/{item_id}", 200)].count == 2
+    assert metrics.histograms[("GET", "<unmatched>", 404)].count == 1
+
+
+def test_request_logging_restarts_without_duplicate_handlers() -> None:
+    """Test that repeated start/stop cycles leave exactly one handler while running and none after."""
+    handlers_before = list(request_logger.handlers)
+    for _ in range(3):
+        start_request_logging()
+        start_request_logging()
+        assert len(request_logger.handlers) == len(handlers_before) + 1
+        stop_request_logging()
+        assert request_logger.handlers == handlers_before
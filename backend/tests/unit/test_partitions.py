@@ -0,0 +1,81 @@
+from contextlib import asynccontextmanager
+from datetime import UTC, date, datetime
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+import pytest
+from starlette.testclient import TestClient
+from tortoise import connections
+
+from backend.app import partitions
+from backend.app.partitions import add_months, ensure_slip_partitions, month_start, partition_month, partition_name
+
+
+def test_month_arithmetic_wraps_years() -> None:
+    """Test that months roll over into the next and previous year."""
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+    assert month_start(date(2025, 4, 1)) == datetime(2025, 4, 1, tzinfo=UTC)
+
+
+def test_partition_names_round_trip() -> None:
+    """Test that partition names encode their month and the default partition is recognised."""
+    assert partition_name(date(2025, 4, 1)) == "slips_y2025m04"
+    assert partition_month("slips_y2025m04") == date(2025, 4, 1)
+    assert partition_month("slips_default") is None
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_skips_unpartitioned_table(client: TestClient) -> None:
+    """Test that nothing is created when slips is a plain table."""
+    assert await ensure_slip_partitions(connections.get("default")) == []
+
+
+class RecordingConnection:
+    """Stands in for a partitioned PostgreSQL connection, recording the statements it runs"""
+
+    connection_name = "default"
+    capabilities = SimpleNamespace(dialect="postgres")
+
+    def __init__(self, partitions: List[str], stray_months: List[date]) -> None:
+        self.partitions = partitions
+        self.stray_months = stray_months
+        self.statements: List[str] = []
+
+    async def execute_query(self, sql: str, values: Optional[List[Any]] = None) -> Tuple[int, List[dict]]:
+        self.statements.append(" ".join(sql.split()))
+        if "pg_partitioned_table" in sql:
+            return 1, [{"?column?": 1}]
+        if "pg_inherits" in sql:
+            return len(self.partitions), [{"name": name} for name in self.partitions]
+        if sql.startswith('SELECT 1 FROM "slips_default"') and values is not None:
+            lower = values[0].date()
+            return 0, [{"?column?": 1}] if lower in self.stray_months else []
+        return 0, []
+
+    async def execute_script(self, sql: str) -> None:
+        self.statements.append(" ".join(sql.split()))
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_moves_rows_out_of_default_partition(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a month with rows in the default partition is created by detaching and re-attaching it."""
+    conn = RecordingConnection(["slips_default", "slips_y2025m04"], stray_months=[date(2025, 6, 1)])
+
+    @asynccontextmanager
+    async def in_transaction(connection_name: str) -> AsyncIterator[RecordingConnection]:
+        yield conn
+
+    monkeypatch.setattr(partitions, "in_transaction", in_transaction)
+
+    created = await ensure_slip_partitions(conn, months_ahead=2, today=date(2025, 4, 15))  # type: ignore[arg-type]
+
+    assert created == ["slips_y2025m05", "slips_y2025m06"]
+    ddl = [statement for statement in conn.statements if not statement.startswith("SELECT")]
+    # May has no stray rows and is created directly; June's rows are moved inside the detach
+    assert ddl[0].startswith('CREATE TABLE IF NOT EXISTS "slips_y2025m05" PARTITION OF "slips"')
+    assert ddl[1] == 'ALTER TABLE "slips" DETACH PARTITION "slips_default"'
+    assert ddl[2].startswith('CREATE TABLE IF NOT EXISTS "slips_y2025m06" PARTITION OF "slips"')
+    assert 'DELETE FROM "slips_default"' in ddl[3] and 'INSERT INTO "slips_y2025m06"' in ddl[3]
+    assert ddl[4] == 'ALTER TABLE "slips" ATTACH PARTITION "slips_default" DEFAULT'
+    assert len(ddl) == 5
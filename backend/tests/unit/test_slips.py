@@ -0,0 +1,182 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Union
+
+import pytest
+from starlette.testclient import TestClient
+
+from backend.app.main import Slip, SlipStatHourly, User
+from backend.tests.unit.helpers import get_unique_username
+
+CARD_NUMBER = "4000123412341234"
+
+
+@pytest.mark.asyncio
+async def test_list_slips_keyset_pagination(client: TestClient) -> None:
+    """Test that pages follow the cursor newest first without overlap."""
+    slips = [await Slip.create(card_number=CARD_NUMBER, amount=Decimal(10 + i)) for i in range(5)]
+
+    seen_ids: List[int] = []
+    cursor = None
+    pages = 0
+    while True:
+        params: Dict[str, Union[str, int]] = {"card_number": CARD_NUMBER, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/slips", params=params)
+        assert resp.status_code == 200
+
+        seen_ids.extend(slip["id"] for slip in resp.json()["slips"])
+        pages += 1
+        cursor = resp.json()["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert sorted(seen_ids) == sorted(slip.id for slip in slips)
+    assert len(set(seen_ids)) == 5
+
+    # Clean up
+    await Slip.filter(card_number=CARD_NUMBER).delete()
+
+
+@pytest.mark.asyncio
+async def test_list_slips_ndjson_stream(client: TestClient) -> None:
+    """Test that the NDJSON mode streams every matching slip across internal pages."""
+    slips = [await Slip.create(card_number=CARD_NUMBER, amount=Decimal("25.50")) for _ in range(3)]
+
+    resp = client.get("/slips", params={"card_number": CARD_NUMBER, "format": "ndjson", "limit": 1})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["id"] for row in rows] == sorted((slip.id for slip in slips), reverse=True)
+
+    # Clean up
+    await Slip.filter(card_number=CARD_NUMBER).delete()
+
+
+def test_list_slips_rejects_invalid_cursor(client: TestClient) -> None:
+    """Test that a malformed cursor is rejected."""
+    resp = client.get("/slips", params={"cursor": "not-a-cursor"})
+
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_slip_stats_from_rollup(client: TestClient) -> None:
+    """Test that per-card totals and daily volumes are folded from the hourly rollup."""
+    # SQLite has no rollup triggers, so hourly rows are written directly
+    await SlipStatHourly.create(
+        card_number=CARD_NUMBER,
+        bucket=datetime(2025, 4, 1, 9),
+        slip_count=2,
+        total_amount=Decimal("30.00"),
+        min_amount=Decimal("10.00"),
+        max_amount=Decimal("20.00"),
+    )
+    await SlipStatHourly.create(
+        card_number=CARD_NUMBER,
+        bucket=datetime(2025, 4, 1, 15),
+        slip_count=1,
+        total_amount=Decimal("60.00"),
+        min_amount=Decimal("60.00"),
+        max_amount=Decimal("60.00"),
+    )
+
+    resp = client.get("/slips/stats", params={"card_number": CARD_NUMBER, "granularity": "day"})
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert data["cards"] == [
+        {
+            "card_number": CARD_NUMBER,
+            "slip_count": 3,
+            "total_amount": "90.00",
+            "min_amount": "10.00",
+            "max_amount": "60.00",
+            "avg_amount": "30.00",
+        }
+    ]
+    assert len(data["buckets"]) == 1
+    assert data["buckets"][0]["bucket"].startswith("2025-04-01T00:00:00")
+    assert data["buckets"][0]["slip_count"] == 3
+
+    resp = client.get("/slips/stats", params={"card_number": CARD_NUMBER})
+    assert [bucket["slip_count"] for bucket in resp.json()["buckets"]] == [2, 1]
+
+    # Clean up
+    await SlipStatHourly.filter(card_number=CARD_NUMBER).delete()
+
+
+@pytest.mark.asyncio
+async def test_list_slips_by_user_id(client: TestClient) -> None:
+    """Test that slips can be listed per owning user."""
+    user = await User.create(username=get_unique_username(), password="hashed", card_number=CARD_NUMBER)
+    owned = await Slip.create(user=user, card_number=CARD_NUMBER, amount=Decimal("5.00"))
+    await Slip.create(card_number=CARD_NUMBER, amount=Decimal("6.00"))
+
+    resp = client.get("/slips", params={"user_id": user.id})
+    assert resp.status_code == 200
+    assert [(slip["id"], slip["user_id"]) for slip in resp.json()["slips"]] == [(owned.id, user.id)]
+
+    # Clean up
+    await Slip.filter(card_number=CARD_NUMBER).delete()
+    await user.delete()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_slips_ndjson_batches(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that NDJSON rows are validated and written per batch, reporting rejected rows."""
+    monkeypatch.setattr("backend.app.main.SLIP_INGEST_BATCH_SIZE", 2)
+    user = await User.create(username=get_unique_username("bulk_user"), password="hashed", card_number=CARD_NUMBER)
+    lines = [
+        json.dumps({"card_number": CARD_NUMBER, "amount": "10.50", "user_id": user.id}),
+        json.dumps({"card_number": CARD_NUMBER, "amount": "-1"}),
+        "not json",
+        json.dumps({"card_number": CARD_NUMBER, "amount": 7, "created_at": "2025-04-01T12:00:00"}),
+        json.dumps({"card_number": CARD_NUMBER, "amount": "3.00", "user_id": 999999}),
+    ]
+
+    resp = client.post("/slips/bulk", content="\n".join(lines) + "\n", headers={"Content-Type": "application/x-ndjson"})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["accepted"] == 2
+    assert body["rejected"] == 3
+    assert [(batch["accepted"], batch["rejected"]) for batch in body["batches"]] == [(1, 1), (1, 1), (0, 1)]
+    assert body["batches"][0]["errors"][0]["row"] == 2
+    assert body["batches"][2]["errors"][0]["error"].startswith("user_id")
+
+    slips = await Slip.filter(card_number=CARD_NUMBER).order_by("amount")
+    assert [slip.amount for slip in slips] == [Decimal("7.00"), Decimal("10.50")]
+    assert slips[1].user_id == user.id
+
+    # Clean up
+    await Slip.filter(card_number=CARD_NUMBER).delete()
+    await user.delete()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_slips_csv_and_json(client: TestClient) -> None:
+    """Test that CSV and JSON array bodies are accepted, and unsupported content types are not."""
+    csv_body = f"card_number,amount,user_id\n{CARD_NUMBER},12.34,\n{CARD_NUMBER},abc,\n"
+    resp = client.post("/slips/bulk", content=csv_body, headers={"Content-Type": "text/csv"})
+    assert resp.status_code == 200
+    assert (resp.json()["accepted"], resp.json()["rejected"]) == (1, 1)
+
+    resp = client.post("/slips/bulk", json=[{"card_number": CARD_NUMBER, "amount": "5.00"}])
+    assert resp.status_code == 200
+    assert resp.json()["accepted"] == 1
+
+    resp = client.post("/slips/bulk", content="{}", headers={"Content-Type": "application/json"})
+    assert resp.status_code == 400
+
+    resp = client.post("/slips/bulk", content="<slips/>", headers={"Content-Type": "application/xml"})
+    assert resp.status_code == 415
+
+    assert await Slip.filter(card_number=CARD_NUMBER).count() == 2
+
+    # Clean up
+    await Slip.filter(card_number=CARD_NUMBER).delete()
@@ -1,9 +1,15 @@
 # backend/tests/unit/test_token.py
+from datetime import timedelta
+
 import pytest
+from fastapi import HTTPException
 from passlib.hash import bcrypt
 from starlette.testclient import TestClient
 
-from backend.app.main import User
+from backend.app import hashing
+from backend.app.hashing import build_password_context
+from backend.app.main import User, get_admin_user, get_current_user, get_token_claims, user_cache
+from backend.app.tokens import SigningKeys, TokenError, decode_token, encode_token
 from backend.tests.unit.helpers import get_unique_username
 
 
@@ -39,3 +45,101 @@ async def test_token_endpoint_invalid_credentials(client: TestClient) -> None:
     # Verify response
     assert response.status_code == 401
     assert response.json()["detail"] == "Incorrect username or password"
+
+
+@pytest.mark.asyncio
+async def test_token_endpoint_rehashes_outdated_password(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that logging in with a hash from an older policy stores a hash with the current policy."""
+    monkeypatch.setattr(hashing, "pwd_context", build_password_context(bcrypt_rounds=4))
+    test_username = get_unique_username("rehash_user")
+    test_password = "rehash_test_pass123"
+    user = await User.create(
+        username=test_username, password=build_password_context(bcrypt_rounds=5).hash(test_password), role="customer"
+    )
+
+    response = client.post("/token", json={"username": test_username, "password": test_password})
+
+    assert response.status_code == 200
+    await user.refresh_from_db()
+    assert user.password.startswith("$2b$04$")
+    assert hashing.verify_password(test_password, user.password)
+
+    await user.delete()
+
+
+def test_tokens_verify_with_rotated_keys() -> None:
+    """Test that tokens signed with a retired key verify while it is still configured."""
+    old_keys = SigningKeys("2024", {"2024": "old-secret"})
+    new_keys = SigningKeys("2025", {"2024": "old-secret", "2025": "new-secret"})
+
+    old_token = encode_token({"sub": "rotated_user"}, timedelta(minutes=5), old_keys)
+    assert decode_token(old_token, new_keys)["sub"] == "rotated_user"
+
+    new_token = encode_token({"sub": "rotated_user"}, timedelta(minutes=5), new_keys)
+    with pytest.raises(TokenError):
+        decode_token(new_token, old_keys)
+
+
+@pytest.mark.asyncio
+async def test_admin_role_is_rechecked_against_users_table(client: TestClient) -> None:
+    """Test that admin routes follow role changes made without model signals, and reject stale tokens."""
+    test_username = get_unique_username("claims_admin")
+    user = await User.create(username=test_username, password=bcrypt.hash("claims_pass123"), role="admin")
+
+    response = client.post("/token", json={"username": test_username, "password": "claims_pass123"})
+    token = response.json()["access_token"]
+    claims = await get_token_claims(token)
+    assert claims["sub"] == test_username
+    assert (await get_admin_user(claims)).username == test_username
+
+    # A queryset update fires no signals, so only the users table knows about the demotion
+    await User.filter(id=user.id).update(role="customer")
+    user_cache.clear()
+    with pytest.raises(HTTPException) as exc_info:
+        await get_admin_user(claims)
+    assert exc_info.value.status_code == 403
+
+    # Neither does a queryset delete
+    await User.filter(id=user.id).delete()
+    user_cache.clear()
+    with pytest.raises(HTTPException) as exc_info:
+        await get_admin_user(claims)
+    assert exc_info.value.status_code == 401
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(claims)
+    assert exc_info.value.status_code == 401
+
+    # Saving the user revokes the tokens minted before the change
+    user = await User.create(username=test_username, password=bcrypt.hash("claims_pass123"), role="admin")
+    user.role = "customer"
+    await user.save()
+    with pytest.raises(HTTPException) as exc_info:
+        await get_token_claims(token)
+    assert exc_info.value.status_code == 401
+
+    response = client.post("/token", json={"username": test_username, "password": "claims_pass123"})
+    with pytest.raises(HTTPException) as exc_info:
+        await get_admin_user(await get_token_claims(response.json()["access_token"]))
+    assert exc_info.value.status_code == 403
+
+    await user.delete()
+
+
+@pytest.mark.asyncio
+async def test_deactivated_user_is_rejected(client: TestClient) -> None:
+    """Test that deactivating a user stops their existing token on user and admin routes."""
+    test_username = get_unique_username("inactive_admin")
+    user = await User.create(username=test_username, password=bcrypt.hash("inactive_pass123"), role="admin")
+
+    response = client.post("/token", json={"username": test_username, "password": "inactive_pass123"})
+    claims = await get_token_claims(response.json()["access_token"])
+    assert (await get_current_user(claims)).username == test_username
+
+    await User.filter(id=user.id).update(is_active=False)
+    user_cache.clear()
+    for dependency in (get_current_user, get_admin_user):
+        with pytest.raises(HTTPException) as exc_info:
+            await dependency(claims)
+        assert exc_info.value.status_code == 401
+
+    await user.delete()
@@ -0,0 +1,23 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+    -- Serve keyset pagination over (created_at, id) for GET /slips. A plain CREATE INDEX blocks
+    -- inserts for the whole build and CONCURRENTLY can't run inside a migration, so the index is
+    -- only built here while slips is empty. On a populated table backfill-slip-users builds it
+    -- with CREATE INDEX CONCURRENTLY instead.
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM "slips") THEN
+            CREATE INDEX IF NOT EXISTS "idx_slips_created_at_id" ON "slips" ("created_at", "id");
+        END IF;
+    END
+    $$;
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+    DROP INDEX IF EXISTS "idx_slips_created_at_id";
+    """
@@ -0,0 +1,89 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+    -- Hourly per-card rollup of slips, read by GET /slips/stats
+    CREATE TABLE IF NOT EXISTS "slip_stats_hourly" (
+        "id" SERIAL NOT NULL PRIMARY KEY,
+        "card_number" VARCHAR(16) NOT NULL,
+        "bucket" TIMESTAMPTZ NOT NULL,
+        "slip_count" BIGINT NOT NULL,
+        "total_amount" DECIMAL(20,2) NOT NULL,
+        "min_amount" DECIMAL(10,2) NOT NULL,
+        "max_amount" DECIMAL(10,2) NOT NULL,
+        CONSTRAINT "uid_slip_stats_hourly_card_bucket" UNIQUE ("card_number", "bucket")
+    );
+    CREATE INDEX IF NOT EXISTS "idx_slip_stats_hourly_bucket" ON "slip_stats_hourly" ("bucket");
+
+    -- Fold each inserting statement (INSERT or COPY) into the rollup in one pass
+    CREATE OR REPLACE FUNCTION slip_stats_after_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO "slip_stats_hourly" ("card_number", "bucket", "slip_count", "total_amount", "min_amount", "max_amount")
+        SELECT "card_number", date_trunc('hour', "created_at"), count(*), sum("amount"), min("amount"), max("amount")
+        FROM new_slips
+        GROUP BY 1, 2
+        ON CONFLICT ("card_number", "bucket") DO UPDATE SET
+            "slip_count" = "slip_stats_hourly"."slip_count" + EXCLUDED."slip_count",
+            "total_amount" = "slip_stats_hourly"."total_amount" + EXCLUDED."total_amount",
+            "min_amount" = LEAST("slip_stats_hourly"."min_amount", EXCLUDED."min_amount"),
+            "max_amount" = GREATEST("slip_stats_hourly"."max_amount", EXCLUDED."max_amount");
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    -- Min and max can't be decremented, so recompute the buckets a delete touched
+    CREATE OR REPLACE FUNCTION slip_stats_after_delete() RETURNS trigger AS $$
+    BEGIN
+        DELETE FROM "slip_stats_hourly" s
+        USING (SELECT DISTINCT "card_number", date_trunc('hour', "created_at") AS "bucket" FROM old_slips) a
+        WHERE s."card_number" = a."card_number" AND s."bucket" = a."bucket";
+
+        INSERT INTO "slip_stats_hourly" ("card_number", "bucket", "slip_count", "total_amount", "min_amount", "max_amount")
+        SELECT s."card_number", a."bucket", count(*), sum(s."amount"), min(s."amount"), max(s."amount")
+        FROM "slips" s
+        JOIN (SELECT DISTINCT "card_number", date_trunc('hour', "created_at") AS "bucket" FROM old_slips) a
+            ON s."card_number" = a."card_number"
+            AND s."created_at" >= a."bucket"
+            AND s."created_at" < a."bucket" + INTERVAL '1 hour'
+        GROUP BY 1, 2;
+
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION slip_stats_after_truncate() RETURNS trigger AS $$
+    BEGIN
+        TRUNCATE "slip_stats_hourly";
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER "slips_stats_insert" AFTER INSERT ON "slips"
+        REFERENCING NEW TABLE AS new_slips
+        FOR EACH STATEMENT EXECUTE FUNCTION slip_stats_after_insert();
+    CREATE TRIGGER "slips_stats_delete" AFTER DELETE ON "slips"
+        REFERENCING OLD TABLE AS old_slips
+        FOR EACH STATEMENT EXECUTE FUNCTION slip_stats_after_delete();
+    CREATE TRIGGER "slips_stats_truncate" AFTER TRUNCATE ON "slips"
+        FOR EACH STATEMENT EXECUTE FUNCTION slip_stats_after_truncate();
+
+    -- Backfill the rollup from the slips that already exist
+    INSERT INTO "slip_stats_hourly" ("card_number", "bucket", "slip_count", "total_amount", "min_amount", "max_amount")
+    SELECT "card_number", date_trunc('hour', "created_at"), count(*), sum("amount"), min("amount"), max("amount")
+    FROM "slips"
+    GROUP BY 1, 2
+    ON CONFLICT ("card_number", "bucket") DO NOTHING;
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+    DROP TRIGGER IF EXISTS "slips_stats_insert" ON "slips";
+    DROP TRIGGER IF EXISTS "slips_stats_delete" ON "slips";
+    DROP TRIGGER IF EXISTS "slips_stats_truncate" ON "slips";
+    DROP FUNCTION IF EXISTS slip_stats_after_insert();
+    DROP FUNCTION IF EXISTS slip_stats_after_delete();
+    DROP FUNCTION IF EXISTS slip_stats_after_truncate();
+    DROP TABLE IF EXISTS "slip_stats_hourly";
+    """
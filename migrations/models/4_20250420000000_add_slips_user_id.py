@@ -0,0 +1,36 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+    -- Nullable column and a NOT VALID constraint are metadata-only changes, so slips stays writable.
+    -- Existing rows are linked afterwards in batches by the backfill-slip-users script, which then
+    -- validates the constraint.
+    ALTER TABLE "slips" ADD COLUMN IF NOT EXISTS "user_id" INT;
+    ALTER TABLE "slips" ADD CONSTRAINT "fk_slips_users_user_id"
+        FOREIGN KEY ("user_id") REFERENCES "users" ("id") ON DELETE SET NULL NOT VALID;
+
+    -- A plain CREATE INDEX blocks writes for the whole build and CONCURRENTLY can't run inside a
+    -- migration, so the indexes are only built here while the tables are empty. On populated
+    -- tables backfill-slip-users builds them with CREATE INDEX CONCURRENTLY instead.
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM "slips") THEN
+            CREATE INDEX IF NOT EXISTS "idx_slips_user_id_created_at" ON "slips" ("user_id", "created_at");
+        END IF;
+        -- The backfill looks owners up by card number
+        IF NOT EXISTS (SELECT 1 FROM "users") THEN
+            CREATE INDEX IF NOT EXISTS "idx_users_card_number" ON "users" ("card_number");
+        END IF;
+    END
+    $$;
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+    DROP INDEX IF EXISTS "idx_users_card_number";
+    DROP INDEX IF EXISTS "idx_slips_user_id_created_at";
+    ALTER TABLE "slips" DROP CONSTRAINT IF EXISTS "fk_slips_users_user_id";
+    ALTER TABLE "slips" DROP COLUMN IF EXISTS "user_id";
+    """
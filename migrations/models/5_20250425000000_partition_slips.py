@@ -0,0 +1,111 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+    -- OFFLINE MAINTENANCE: this rewrites every slip in one transaction and holds an ACCESS
+    -- EXCLUSIVE lock on slips until it commits, so reads and writes block for the whole copy.
+    -- Run it in a maintenance window with the app stopped; it is not an online conversion.
+    --
+    -- Rebuild slips as a table range-partitioned by month on created_at. The primary key has to
+    -- include the partition key; ids stay unique because they still come from slips_id_seq.
+    ALTER TABLE "slips" RENAME TO "slips_unpartitioned";
+    ALTER INDEX "slips_pkey" RENAME TO "slips_unpartitioned_pkey";
+    ALTER INDEX "idx_slips_card_number" RENAME TO "idx_slips_unpartitioned_card_number";
+    -- Only present once backfill-slip-users has built them on a populated table
+    ALTER INDEX IF EXISTS "idx_slips_created_at_id" RENAME TO "idx_slips_unpartitioned_created_at_id";
+    ALTER INDEX IF EXISTS "idx_slips_user_id_created_at" RENAME TO "idx_slips_unpartitioned_user_id_created_at";
+
+    CREATE TABLE "slips" (
+        "id" INT NOT NULL DEFAULT nextval('slips_id_seq'),
+        "user_id" INT,
+        "card_number" VARCHAR(16) NOT NULL,
+        "amount" DECIMAL(10,2) NOT NULL,
+        "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT "slips_pkey" PRIMARY KEY ("id", "created_at"),
+        CONSTRAINT "fk_slips_users_user_id" FOREIGN KEY ("user_id") REFERENCES "users" ("id") ON DELETE SET NULL
+    ) PARTITION BY RANGE ("created_at");
+    ALTER SEQUENCE "slips_id_seq" OWNED BY "slips"."id";
+
+    -- Monthly partitions covering the existing rows and the next three months; rows outside
+    -- them land in the default partition until the partition manager catches up
+    DO $$
+    DECLARE
+        partition_month DATE;
+        last_month DATE;
+    BEGIN
+        SELECT date_trunc('month', COALESCE(MIN(created_at), now()) AT TIME ZONE 'UTC')::date
+        INTO partition_month FROM slips_unpartitioned;
+        last_month := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date;
+        WHILE partition_month <= last_month LOOP
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF "slips" FOR VALUES FROM (%L) TO (%L)',
+                'slips_y' || to_char(partition_month, 'YYYY') || 'm' || to_char(partition_month, 'MM'),
+                partition_month::timestamp AT TIME ZONE 'UTC',
+                (partition_month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+            );
+            partition_month := (partition_month + interval '1 month')::date;
+        END LOOP;
+    END
+    $$;
+    CREATE TABLE IF NOT EXISTS "slips_default" PARTITION OF "slips" DEFAULT;
+
+    -- The rollup already holds these rows, so copy before the stats triggers exist
+    INSERT INTO "slips" ("id", "user_id", "card_number", "amount", "created_at", "updated_at")
+    SELECT "id", "user_id", "card_number", "amount", "created_at", "updated_at" FROM "slips_unpartitioned";
+    DROP TABLE "slips_unpartitioned";
+
+    -- Indexes on the parent are created on every partition, current and future
+    CREATE INDEX IF NOT EXISTS "idx_slips_card_number" ON "slips" ("card_number");
+    CREATE INDEX IF NOT EXISTS "idx_slips_created_at_id" ON "slips" ("created_at", "id");
+    CREATE INDEX IF NOT EXISTS "idx_slips_user_id_created_at" ON "slips" ("user_id", "created_at");
+
+    CREATE TRIGGER "slips_stats_insert" AFTER INSERT ON "slips"
+        REFERENCING NEW TABLE AS new_slips
+        FOR EACH STATEMENT EXECUTE FUNCTION slip_stats_after_insert();
+    CREATE TRIGGER "slips_stats_delete" AFTER DELETE ON "slips"
+        REFERENCING OLD TABLE AS old_slips
+        FOR EACH STATEMENT EXECUTE FUNCTION slip_stats_after_delete();
+    CREATE TRIGGER "slips_stats_truncate" AFTER TRUNCATE ON "slips"
+        FOR EACH STATEMENT EXECUTE FUNCTION slip_stats_after_truncate();
+    """
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+    -- Offline maintenance as well: copies every slip back under an exclusive lock
+    ALTER TABLE "slips" RENAME TO "slips_partitioned";
+    ALTER INDEX "slips_pkey" RENAME TO "slips_partitioned_pkey";
+    ALTER INDEX "idx_slips_card_number" RENAME TO "idx_slips_partitioned_card_number";
+    ALTER INDEX "idx_slips_created_at_id" RENAME TO "idx_slips_partitioned_created_at_id";
+    ALTER INDEX "idx_slips_user_id_created_at" RENAME TO "idx_slips_partitioned_user_id_created_at";
+
+    CREATE TABLE "slips" (
+        "id" INT NOT NULL PRIMARY KEY DEFAULT nextval('slips_id_seq'),
+        "user_id" INT,
+        "card_number" VARCHAR(16) NOT NULL,
+        "amount" DECIMAL(10,2) NOT NULL,
+        "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT "fk_slips_users_user_id" FOREIGN KEY ("user_id") REFERENCES "users" ("id") ON DELETE SET NULL
+    );
+    ALTER SEQUENCE "slips_id_seq" OWNED BY "slips"."id";
+
+    INSERT INTO "slips" ("id", "user_id", "card_number", "amount", "created_at", "updated_at")
+    SELECT "id", "user_id", "card_number", "amount", "created_at", "updated_at" FROM "slips_partitioned";
+    DROP TABLE "slips_partitioned";
+
+    CREATE INDEX IF NOT EXISTS "idx_slips_card_number" ON "slips" ("card_number");
+    CREATE INDEX IF NOT EXISTS "idx_slips_created_at_id" ON "slips" ("created_at", "id");
+    CREATE INDEX IF NOT EXISTS "idx_slips_user_id_created_at" ON "slips" ("user_id", "created_at");
+
+    CREATE TRIGGER "slips_stats_insert" AFTER INSERT ON "slips"
+        REFERENCING NEW TABLE AS new_slips
+        FOR EACH STATEMENT EXECUTE FUNCTION slip_stats_after_insert();
+    CREATE TRIGGER "slips_stats_delete" AFTER DELETE ON "slips"
+        REFERENCING OLD TABLE AS old_slips
+        FOR EACH STATEMENT EXECUTE FUNCTION slip_stats_after_delete();
+    CREATE TRIGGER "slips_stats_truncate" AFTER TRUNCATE ON "slips"
+        FOR EACH STATEMENT EXECUTE FUNCTION slip_stats_after_truncate();
+    """